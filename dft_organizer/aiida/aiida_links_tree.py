@@ -171,6 +171,55 @@ def find_first_last_pks(conn, start_pk: int) -> Tuple[int, int]:
     return first_pk, last_pk
 
 
+def fetch_first_last_structure_uuids(
+    conn, start_uuids: List[str]
+) -> dict[str, Tuple[Optional[str], Optional[str]]]:
+    """
+    For every start node UUID, the UUIDs of the StructureData nodes with
+    the lowest and highest pk in its provenance tree (upstream and
+    downstream), found in one recursive query without loading nodes.
+    Keys are the start UUIDs as stored in the database.
+    """
+    if not start_uuids:
+        return {}
+    cur = conn.cursor()
+    # node_type is 'data.core.structure.StructureData.' since AiiDA 2.0,
+    # 'data.structure.StructureData.' before
+    sql = """
+    WITH RECURSIVE start AS (
+      SELECT id, uuid::TEXT AS start_uuid
+      FROM db_dbnode
+      WHERE uuid::TEXT = ANY(%s)
+    ),
+    tree(start_uuid, node_id, direction) AS (
+      SELECT start_uuid, id, dirs.direction
+      FROM start CROSS JOIN (SELECT 'down' AS direction UNION ALL SELECT 'up') AS dirs
+    UNION
+      SELECT t.start_uuid,
+             CASE WHEN t.direction = 'down' THEN link.output_id ELSE link.input_id END,
+             t.direction
+      FROM tree AS t
+      JOIN db_dblink AS link
+        ON (t.direction = 'down' AND link.input_id = t.node_id)
+        OR (t.direction = 'up' AND link.output_id = t.node_id)
+    )
+    SELECT t.start_uuid,
+           (array_agg(n.uuid::TEXT ORDER BY n.id ASC))[1]  AS first_uuid,
+           (array_agg(n.uuid::TEXT ORDER BY n.id DESC))[1] AS last_uuid
+    FROM tree AS t
+    JOIN db_dbnode AS n ON n.id = t.node_id
+    WHERE n.node_type LIKE 'data.%%structure.StructureData.'
+    GROUP BY t.start_uuid;
+    """
+    cur.execute(sql, (list(start_uuids),))
+    found = {
+        start_uuid: (first_uuid, last_uuid)
+        for start_uuid, first_uuid, last_uuid in cur.fetchall()
+    }
+    cur.close()
+    return found
+
+
 def _node_short_info(pk: int):
     node = load_node(pk)
     base = f"pk={pk} {node.__class__.__name__}"
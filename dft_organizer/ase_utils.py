@@ -1,5 +1,7 @@
 import math
 from functools import reduce
+
+import numpy as np
 from ase.atoms import Atoms
 
 
@@ -131,4 +133,27 @@ def get_formula(ase_obj, find_gcd=True):
         index = "" if index == 1 else str(index)
         formula += atom + index
 
-    return formula
\ No newline at end of file
+    return formula
+
+def displacement_metrics(atoms_init: Atoms, atoms_final: Atoms) -> dict:
+    """
+    Sum of squared and root-mean-square atomic displacements between two
+    structures with the same atom order, using the minimum image along the
+    periodic directions of the final cell, so atoms moved across a cell
+    boundary are not counted as displaced by a lattice vector.
+    """
+    pos_init = atoms_init.get_positions()
+    pos_final = atoms_final.get_positions()
+    if pos_init.shape != pos_final.shape:
+        raise ValueError("Initial and final structures have different sizes/order")
+
+    disp = pos_final - pos_init
+    pbc = np.asarray(atoms_final.get_pbc(), dtype=bool)
+    cell = np.asarray(atoms_final.get_cell())
+    if pbc.any() and abs(np.linalg.det(cell)) > 1e-12:
+        frac = np.linalg.solve(cell.T, disp.T).T
+        frac[:, pbc] -= np.round(frac[:, pbc])
+        disp = frac @ cell
+
+    sq = np.sum(disp**2, axis=1)
+    return {"sum_sq_disp": float(np.sum(sq)), "rmsd_disp": float(np.sqrt(np.mean(sq)))}
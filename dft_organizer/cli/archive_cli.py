@@ -4,6 +4,17 @@ import click
 
 from dft_organizer.core import archive_and_save
 from dft_organizer.core import generate_report_for_uuid
+from dft_organizer.core import generate_reports_for_uuids, read_uuid_file
+from dft_organizer.cli.options import (
+    backend_option,
+    bundle_option,
+    file_policy_option,
+    jobs_option,
+    profile_option,
+    scan_options,
+    split_by_option,
+    summary_format_option,
+)
 
 
 @click.group()
@@ -28,9 +39,40 @@ def cli():
     default=False,
     help="Skip entries with errors in the report",
 )
-def archive(path, report, aiida, skip_errors):
+@jobs_option
+@split_by_option
+@bundle_option
+@profile_option
+@file_policy_option
+@backend_option
+@scan_options
+def archive(
+    path,
+    report,
+    aiida,
+    skip_errors,
+    jobs,
+    split_by,
+    bundle,
+    profile,
+    file_policy,
+    backend,
+    **scan_options,
+):
     """Archive directory, create report"""
-    archive_and_save(Path(path), make_report=report, aiida=aiida, skip_errors=skip_errors)
+    archive_and_save(
+        Path(path),
+        make_report=report,
+        aiida=aiida,
+        skip_errors=skip_errors,
+        workers=jobs,
+        split_by=split_by,
+        bundle=bundle,
+        profile=profile,
+        file_policy=file_policy,
+        backend=backend,
+        **scan_options,
+    )
 
 
 @cli.command()
@@ -42,12 +84,28 @@ def archive(path, report, aiida, skip_errors):
 )
 @click.option(
     "--uuid",
-    required=True,
+    default=None,
     type=str,
     help="UUID of the calculation (e.g., 0ea8a6be-7199-4c3e-9263-fae76e8d081e)",
 )
-def report(path, uuid):
-    """Generate report for a specific calculation by UUID."""
+@click.option(
+    "--uuid-file",
+    default=None,
+    type=click.Path(exists=True, dir_okay=False),
+    help="File with one UUID per line; writes one combined summary and error report",
+)
+@summary_format_option
+def report(path, uuid, uuid_file, summary_format):
+    """Generate report for a calculation by UUID or for a list of UUIDs."""
+    if (uuid is None) == (uuid_file is None):
+        raise click.UsageError("Pass exactly one of --uuid and --uuid-file")
+
+    if uuid_file is not None:
+        generate_reports_for_uuids(
+            Path(path), read_uuid_file(Path(uuid_file)), summary_format=summary_format
+        )
+        return
+
     clean_uuid = uuid.replace("-", "")
     generate_report_for_uuid(Path(path), clean_uuid)
 
@@ -0,0 +1,173 @@
+from pathlib import Path
+
+import click
+
+from dft_organizer.core.file_policy import FILE_POLICIES
+from dft_organizer.core.sevenzip import ARCHIVE_BACKENDS, COMPRESSION_PROFILES, DEFAULT_PROFILE
+from dft_organizer.parse_cache import DEFAULT_CACHE_PATH, ParseCache
+
+
+jobs_option = click.option(
+    "--jobs",
+    "-j",
+    default=1,
+    type=click.IntRange(min=1),
+    help="Number of worker processes parsing calculations in parallel",
+)
+
+fast_detect_option = click.option(
+    "--fast-detect/--no-fast-detect",
+    default=False,
+    help="Detect engines from file names, reading at most one file header per directory",
+)
+
+fast_crystal_option = click.option(
+    "--fast-crystal/--no-fast-crystal",
+    default=False,
+    help="Parse CRYSTAL outputs with the summary-only fast path (full parser as fallback)",
+)
+
+incremental_option = click.option(
+    "--incremental/--no-incremental",
+    default=False,
+    help="Re-parse only calculations changed since the previous scan (manifest stored next to --path)",
+)
+
+stream_option = click.option(
+    "--stream/--no-stream",
+    default=False,
+    help="Write summary rows in batches during the scan instead of keeping them in memory",
+)
+
+summary_format_option = click.option(
+    "--format",
+    "summary_format",
+    default="csv",
+    type=click.Choice(["csv", "parquet", "ipc"]),
+    help="Summary file format; parquet and ipc keep typed and list columns",
+)
+
+max_depth_option = click.option(
+    "--max-depth",
+    default=None,
+    type=click.IntRange(min=1),
+    help="Do not look for calculations deeper than this below --path",
+)
+
+ignore_option = click.option(
+    "--ignore",
+    multiple=True,
+    metavar="GLOB",
+    help="Skip directories matching the glob (name or path relative to --path), repeatable",
+)
+
+prune_calculations_option = click.option(
+    "--prune-calculations/--no-prune-calculations",
+    default=False,
+    help="Do not descend into directories that already contain a calculation output",
+)
+
+scf_trajectories_option = click.option(
+    "--scf-trajectories/--no-scf-trajectories",
+    default=False,
+    help="Save per-iteration SCF energies, deltas and Fermi levels to scf_<time>.parquet "
+    "and add scf_iterations / scf_final_delta columns",
+)
+
+
+split_by_option = click.option(
+    "--split-by",
+    default=None,
+    type=click.Choice(["calculation", "shard"]),
+    help="Archive every calculation directory (or AiiDA xx/yy shard) separately, "
+    "--jobs archives in parallel",
+)
+
+bundle_option = click.option(
+    "--bundle/--no-bundle",
+    default=True,
+    help="With --split-by, bundle the per-directory archives into the root archive",
+)
+
+profile_option = click.option(
+    "--profile",
+    default=DEFAULT_PROFILE,
+    type=click.Choice(list(COMPRESSION_PROFILES)),
+    help=f"Compression profile: LZMA2 preset 9 (max), 5 (balanced) or 1 (fast), "
+    f"Deflate, Zstandard, Brotli or store-only (default: {DEFAULT_PROFILE})",
+)
+
+file_policy_option = click.option(
+    "--file-policy",
+    default=None,
+    type=click.Choice(list(FILE_POLICIES)),
+    help="Store compressed files and compress binaries (fort.9, fort.20, HDF5, ...) with Deflate, "
+    "by file name (names) or also by the entropy of the first 64 KiB (probe)",
+)
+
+backend_option = click.option(
+    "--backend",
+    default="auto",
+    type=click.Choice(ARCHIVE_BACKENDS),
+    help="Archiver: the multithreaded 7-Zip executable (7z), py7zr, "
+    "or auto (7-Zip when found on PATH, default)",
+)
+
+extract_jobs_option = click.option(
+    "--extract-jobs",
+    default=1,
+    type=click.IntRange(min=1),
+    help="Number of archives extracted in parallel",
+)
+
+
+def _store_parse_cache_size(ctx, param, value):
+    ctx.meta["parse_cache_size"] = value
+
+
+def _make_parse_cache(ctx, param, value):
+    if value is None:
+        return None
+    return ParseCache(Path(value), max_bytes=ctx.meta["parse_cache_size"] * 1024**2)
+
+
+parse_cache_size_option = click.option(
+    "--parse-cache-size",
+    default=512,
+    type=click.IntRange(min=1),
+    is_eager=True,
+    expose_value=False,
+    callback=_store_parse_cache_size,
+    help="Size limit of the parse cache in MB, least recently used results are evicted",
+)
+
+parse_cache_option = click.option(
+    "--parse-cache",
+    is_flag=False,
+    flag_value=str(DEFAULT_CACHE_PATH),
+    default=None,
+    type=click.Path(dir_okay=False),
+    callback=_make_parse_cache,
+    help=f"Cache parser results by output file content (default file: {DEFAULT_CACHE_PATH})",
+)
+
+
+def scan_options(func):
+    """Attach the scan and report options shared by the commands as keyword arguments"""
+    for option in reversed(
+        (
+            fast_detect_option,
+            fast_crystal_option,
+            incremental_option,
+            parse_cache_option,
+            parse_cache_size_option,
+            stream_option,
+            summary_format_option,
+            max_depth_option,
+            ignore_option,
+            prune_calculations_option,
+            scf_trajectories_option,
+        )
+    ):
+        func = option(func)
+    return func
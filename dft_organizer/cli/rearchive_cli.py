@@ -3,6 +3,12 @@ from pathlib import Path
 import click
 
 from dft_organizer.core import restore_archives_iterative
+from dft_organizer.cli.options import (
+    backend_option,
+    extract_jobs_option,
+    jobs_option,
+    scan_options,
+)
 
 
 @click.command()
@@ -27,10 +33,22 @@ from dft_organizer.core import restore_archives_iterative
     default=False,
     help="Skip entries with errors in the report",
 )
-
-def cli(path, report, aiida, skip_errors):
+@jobs_option
+@extract_jobs_option
+@backend_option
+@scan_options
+def cli(path, report, aiida, skip_errors, jobs, extract_jobs, backend, **scan_options):
     """Unpack 7z archive or restore archives in a directory."""
-    restore_archives_iterative(Path(path), generate_reports=report, aiida=aiida, skip_errors=skip_errors)
+    restore_archives_iterative(
+        Path(path),
+        generate_reports=report,
+        aiida=aiida,
+        skip_errors=skip_errors,
+        workers=jobs,
+        backend=backend,
+        extract_workers=extract_jobs,
+        **scan_options,
+    )
 
 
 if __name__ == "__main__":
@@ -3,6 +3,7 @@ from pathlib import Path
 import click
 
 from dft_organizer.core import generate_reports_only
+from dft_organizer.cli.options import jobs_option, scan_options
 
 
 @click.command()
@@ -22,12 +23,19 @@ from dft_organizer.core import generate_reports_only
     default=False,
     help="Skip entries with errors in the report",
 )
-
-def cli(path: str, aiida: bool, skip_errors: bool) -> None:
+@jobs_option
+@scan_options
+def cli(path: str, aiida: bool, skip_errors: bool, jobs: int, **scan_options) -> None:
     """
     Generate summary CSV and error reports without archiving.
     """
-    generate_reports_only(Path(path), aiida=aiida, skip_errors=skip_errors)
+    generate_reports_only(
+        Path(path),
+        aiida=aiida,
+        skip_errors=skip_errors,
+        workers=jobs,
+        **scan_options,
+    )
 
 
 if __name__ == "__main__":
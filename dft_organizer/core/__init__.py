@@ -3,11 +3,14 @@ from dft_organizer.core.reporting import (
     save_reports,
     generate_reports_only,
     generate_report_for_uuid,
+    generate_reports_for_uuids,
+    read_uuid_file,
 )
 from dft_organizer.core.sevenzip import (
     extract_7z,
     compress_with_7z
 )
+from dft_organizer.core.parallel_archive import compress_units
 from dft_organizer.core.archive_core import (
     archive_and_save,
     restore_archives_iterative,
@@ -20,6 +23,9 @@ __all__ = [
     "save_reports",
     "generate_reports_only",
     "generate_report_for_uuid",
+    "generate_reports_for_uuids",
+    "read_uuid_file",
     "extract_7z",
-    "compress_with_7z"
+    "compress_with_7z",
+    "compress_units",
 ]
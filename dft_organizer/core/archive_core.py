@@ -1,84 +1,153 @@
-import json
-import os
+from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Union
 
 import polars as pl
 
 from dft_organizer.core import scan_calculations, save_reports
 from dft_organizer.core import compress_with_7z, extract_7z
 from dft_organizer.core import generate_reports_only
-
-
-def _serialize_nested(v):
-    if v is None:
-        return ""
-    return json.dumps(v)
+from dft_organizer.core.file_policy import FILE_POLICIES, FilePolicy
+from dft_organizer.core.parallel_archive import compress_units, extract_nested_archives
+from dft_organizer.core.sevenzip import DEFAULT_PROFILE, file_policy_supported
+from dft_organizer.core.schema import SummaryColumns, summary_path
+from dft_organizer.core.summary_writer import SummaryWriter
+from dft_organizer.core.trajectories import ScfTrajectoryWriter
 
 
 def archive_and_save(
     root_dir: Path,
     make_report: bool = True,
     aiida: bool = False,
-    skip_errors: bool = False
+    skip_errors: bool = False,
+    workers: int = 1,
+    stream: bool = False,
+    summary_format: str = "csv",
+    scf_trajectories: bool = False,
+    split_by: Optional[str] = None,
+    bundle: bool = True,
+    profile: str = DEFAULT_PROFILE,
+    file_policy: Union[str, FilePolicy, None] = None,
+    backend: str = "auto",
+    **scan_options,
 ) -> Optional[pl.DataFrame]:
     """
-    Archive directory, create report
+    Archive directory, create report (summary as csv, parquet or ipc).
+    With stream=True summary rows are written in batches during the scan
+    and no DataFrame is returned.
+    With scf_trajectories the SCF iterations go to scf_<time>.parquet.
+    With split_by ("calculation" or "shard") every calculation directory or
+    AiiDA xx/yy shard gets its own archive, built by workers processes in
+    parallel and bundled into the root archive unless bundle=False.
+    profile selects the compression (see sevenzip.COMPRESSION_PROFILES).
+    file_policy ("names", "probe" or a FilePolicy) stores already compressed
+    files and compresses binary ones lightly instead of with profile.
+    backend: "auto" (7-Zip executable if found, else py7zr), "7z" or "py7zr".
+    Extra keyword arguments are passed to scan_calculations.
     """
     root_path = Path(root_dir).resolve()
     if not root_path.exists():
         print(f"Directory does not exist: {root_path}")
         return None
 
-    summary_store = []
+    summary_store = SummaryColumns()
     error_dict_crystal = {}
     error_dict_fleur = {}
 
     if make_report:
+        time_now = datetime.now().strftime("%Y_%m_%d_%H_%M_%S")
+        summary_writer = None
+        if stream:
+            summary_writer = SummaryWriter(
+                summary_path(root_path.parent, f"summary_{time_now}", summary_format),
+                summary_format,
+            )
+        scf_writer = None
+        if scf_trajectories:
+            scf_writer = ScfTrajectoryWriter(
+                summary_path(root_path.parent, f"scf_{time_now}", "parquet")
+            )
+
         summary_store, error_dict_crystal, error_dict_fleur = scan_calculations(
             root_path,
             aiida=aiida,
             verbose=True,
-            skip_errors=skip_errors
+            skip_errors=skip_errors,
+            workers=workers,
+            summary_writer=summary_writer,
+            scf_writer=scf_writer,
+            **scan_options,
+        )
+
+        if summary_writer is not None:
+            summary_writer.close()
+        if scf_writer is not None and scf_writer.close() is not None:
+            print(f"SCF trajectories saved to: {scf_writer.path}")
+        save_reports(
+            root_path,
+            summary_store,
+            error_dict_crystal,
+            error_dict_fleur,
+            time_now=time_now,
+            summary_format=summary_format,
+        )
+
+    if isinstance(file_policy, str):
+        file_policy = FILE_POLICIES[file_policy]
+    if file_policy is not None and not file_policy_supported(backend, profile):
+        print(
+            "File policy needs the 7-Zip executable and a profile it writes, "
+            f"compressing all files with {profile}"
         )
-        save_reports(root_path, summary_store, error_dict_crystal, error_dict_fleur)
 
     root_archive_path = root_path.parent / f"{root_path.name}.7z"
-    if compress_with_7z(root_path, root_archive_path):
+    if split_by is not None:
+        if compress_units(
+            root_path,
+            split_by,
+            workers=workers,
+            bundle=bundle,
+            profile=profile,
+            file_policy=file_policy,
+            backend=backend,
+        ):
+            print(f"Done! Archives created: {root_archive_path if bundle else root_path}")
+        else:
+            print(f"Failed to archive some directories of {root_path}")
+    elif compress_with_7z(
+        root_path,
+        root_archive_path,
+        profile=profile,
+        file_policy=file_policy,
+        backend=backend,
+    ):
         print(f"Done! Archive created: {root_archive_path}")
     else:
         print(f"Failed to archive root directory: {root_path}")
 
-     # safe df creation
     if summary_store:
-        nested_keys = ["cell", "positions", "pbc", "numbers", "symbols"]
-        flat_summary = []
-        for row in summary_store:
-            try:
-                row = dict(row)
-                for k in nested_keys:
-                    if k in row:
-                        try:
-                            row[k] = _serialize_nested(row[k])
-                        except Exception:
-                            row[k] = None
-                flat_summary.append(row)
-            except Exception:
-                continue
-
-        if flat_summary:
-            try:
-                return pl.DataFrame(flat_summary)
-            except Exception:
-                return None
+        return summary_store.to_frame()
 
     return None
 
 
 def restore_archives_iterative(
-    start_path: Path, generate_reports: bool = True, aiida: bool = False, skip_errors: bool = False
+    start_path: Path,
+    generate_reports: bool = True,
+    aiida: bool = False,
+    skip_errors: bool = False,
+    workers: int = 1,
+    backend: str = "auto",
+    extract_workers: int = 1,
+    **scan_options,
 ):
-    """Iteratively restore archives level by level"""
+    """
+    Restore a root archive or directory with nested archives through a
+    work queue: every extraction is searched for further archives, and up
+    to extract_workers archives are extracted in parallel.
+    backend: "auto" (7-Zip executable if found, else py7zr), "7z" or "py7zr".
+    Extra keyword arguments are passed to scan_calculations.
+    """
     start_path = Path(start_path)
     extracted_root = None
 
@@ -87,7 +156,7 @@ def restore_archives_iterative(
 
         target_dir = start_path.parent
 
-        if extract_7z(start_path, target_dir):
+        if extract_7z(start_path, target_dir, backend):
             archive_name = start_path.stem
             start_path.unlink()
 
@@ -111,29 +180,12 @@ def restore_archives_iterative(
     if extracted_root is None:
         extracted_root = start_path
 
-    iteration = 0
-    while True:
-        iteration += 1
-        print(f"\n--- Iteration {iteration} ---")
-
-        archives = list(start_path.glob("**/*.7z"))
-
-        if not archives:
-            print("✓ No more archives found. Done!")
-            break
-
-        print(f"Found archives: {len(archives)}")
-
-        for archive_path in archives:
-            target_dir = archive_path.parent
-
-            print(f"  Extracting: {archive_path.relative_to(start_path)}")
-
-            if extract_7z(archive_path, target_dir):
-                archive_path.unlink()
-            else:
-                print(f"  Skipping: failed to extract {archive_path}")
+    print(f"\n--- Extracting nested archives with {extract_workers} workers ---")
+    if extract_nested_archives(start_path, workers=extract_workers, backend=backend):
+        print("✓ No more archives found. Done!")
 
     # generate reports after all extraction is complete
     if generate_reports:
-        generate_reports_only(extracted_root, aiida, skip_errors)
+        generate_reports_only(
+            extracted_root, aiida, skip_errors, workers=workers, **scan_options
+        )
@@ -0,0 +1,96 @@
+import fnmatch
+from pathlib import Path
+from typing import Sequence
+
+import numpy as np
+
+
+# compression classes of archived files
+FULL = "full"
+LIGHT = "light"
+STORE = "store"
+
+# already compressed data
+STORE_PATTERNS = (
+    "*.7z", "*.gz", "*.tgz", "*.bz2", "*.xz", "*.zip", "*.zst", "*.lz4",
+    "*.png", "*.jpg", "*.jpeg",
+)
+# binary wavefunctions, density matrices and charge densities:
+# CRYSTAL fort.9 / fort.20 / fort.13 / fort.80, FLEUR HDF5 files,
+# cdn1 and mixing history, numpy .npy arrays
+LIGHT_PATTERNS = (
+    "fort.9", "fort.13", "fort.20", "fort.80",
+    "*.hdf", "*.h5", "cdn1", "cdn_last", "mixing_history*", "broyd*",
+    "*.npy",
+)
+
+PROBE_BLOCK = 64 * 1024
+# Shannon entropy of the first block in bits per byte; text outputs
+# stay around 3-5, double precision binaries at 6-7.7 (the exponent bytes
+# still compress), compressed or encrypted data close to 8
+STORE_ENTROPY = 7.9
+LIGHT_ENTROPY = 6.0
+
+
+def byte_entropy(data: bytes) -> float:
+    """Shannon entropy of a byte string in bits per byte"""
+    if not data:
+        return 0.0
+    counts = np.bincount(np.frombuffer(data, dtype=np.uint8), minlength=256)
+    p = counts[counts > 0] / len(data)
+    return float(-(p * np.log2(p)).sum())
+
+
+class FilePolicy:
+    """
+    Per-file compression class for archiving: files matching store
+    patterns are stored, files matching light patterns are compressed with
+    a fast setting, everything else with the full archive profile.
+    Patterns are globs matched against file names.
+
+    With probe, the entropy of the first PROBE_BLOCK bytes decides for
+    files not matched by a store pattern: nearly random data is stored,
+    binary-looking data is compressed lightly.
+    """
+
+    def __init__(
+        self,
+        store: Sequence[str] = STORE_PATTERNS,
+        light: Sequence[str] = LIGHT_PATTERNS,
+        probe: bool = False,
+    ):
+        self.store = tuple(store)
+        self.light = tuple(light)
+        self.probe = probe
+
+    @staticmethod
+    def _matches(name: str, patterns: Sequence[str]) -> bool:
+        return any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns)
+
+    def _probe(self, path: Path) -> float:
+        try:
+            with open(path, "rb") as f:
+                return byte_entropy(f.read(PROBE_BLOCK))
+        except OSError:
+            return 0.0
+
+    def classify(self, path: Path) -> str:
+        name = path.name
+        if self._matches(name, self.store):
+            return STORE
+        light = self._matches(name, self.light)
+        if not self.probe:
+            return LIGHT if light else FULL
+
+        entropy = self._probe(path)
+        if entropy >= STORE_ENTROPY:
+            return STORE
+        if light or entropy >= LIGHT_ENTROPY:
+            return LIGHT
+        return FULL
+
+
+FILE_POLICIES = {
+    "names": FilePolicy(),
+    "probe": FilePolicy(probe=True),
+}
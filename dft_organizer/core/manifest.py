@@ -0,0 +1,119 @@
+import hashlib
+import json
+import os
+import sqlite3
+from pathlib import Path
+from typing import Any, Optional
+
+
+# files whose changes invalidate the cached scan result of a directory
+TRACKED_FILES = (
+    "OUTPUT",
+    "INPUT",
+    "fort.87",
+    "SEEBECK.DAT",
+    "SIGMA.DAT",
+    "BAND.DAT",
+    "DOSS.DAT",
+    "fort.25",
+    "out",
+    "out.xml",
+    "inp.xml",
+    "relax.xml",
+    "fleur.error",
+)
+
+
+def manifest_path(root_path: Path) -> Path:
+    """Location of the manifest stored next to the scanned root"""
+    root_path = Path(root_path).resolve()
+    return root_path.parent / f".{root_path.name}.manifest.sqlite"
+
+
+def directory_fingerprint(
+    current_dir: Path, filenames: list[str], options: Optional[dict] = None
+) -> str:
+    """
+    Hash the file listing, the mtime/size/inode of the tracked files
+    and the scan options that influence the result.
+    """
+    stats = []
+    for name in TRACKED_FILES:
+        if name not in filenames:
+            continue
+        try:
+            st = os.stat(current_dir / name)
+        except OSError:
+            continue
+        stats.append([name, st.st_mtime_ns, st.st_size, st.st_ino])
+
+    payload = json.dumps(
+        {"files": stats, "names": sorted(filenames), "options": options or {}},
+        sort_keys=True,
+    )
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+class CalculationManifest:
+    """
+    SQLite manifest of scanned directories, keyed by the path relative
+    to the root, with the fingerprint and the cached scan result.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS calculations (
+                directory TEXT PRIMARY KEY,
+                fingerprint TEXT NOT NULL,
+                result TEXT NOT NULL
+            )
+            """
+        )
+        self.reused = 0
+        self.parsed = 0
+        self._seen: set[str] = set()
+
+    def lookup(self, directory: str, fingerprint: str) -> Optional[dict[str, Any]]:
+        """Return the cached result if the directory is unchanged"""
+        self._seen.add(directory)
+        row = self.conn.execute(
+            "SELECT fingerprint, result FROM calculations WHERE directory = ?",
+            (directory,),
+        ).fetchone()
+        if row is None or row[0] != fingerprint:
+            return None
+        self.reused += 1
+        return json.loads(row[1])
+
+    def store(self, directory: str, fingerprint: str, result: dict[str, Any]) -> None:
+        self._seen.add(directory)
+        self.parsed += 1
+        self.conn.execute(
+            "INSERT OR REPLACE INTO calculations (directory, fingerprint, result) VALUES (?, ?, ?)",
+            (directory, fingerprint, json.dumps(result)),
+        )
+
+    def prune(self) -> int:
+        """Drop directories that were not seen during this scan"""
+        stale = [
+            directory
+            for (directory,) in self.conn.execute("SELECT directory FROM calculations")
+            if directory not in self._seen
+        ]
+        self.conn.executemany(
+            "DELETE FROM calculations WHERE directory = ?", [(d,) for d in stale]
+        )
+        return len(stale)
+
+    def close(self) -> None:
+        self.conn.commit()
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,90 @@
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Executor, ProcessPoolExecutor, wait
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+
+def bounded_map(
+    func: Callable[[Any], Any],
+    items: Iterable[Any],
+    workers: int = 1,
+    max_in_flight: Optional[int] = None,
+    executor_cls: type[Executor] = ProcessPoolExecutor,
+    initializer: Optional[Callable[..., None]] = None,
+    initargs: tuple = (),
+) -> Iterator[Any]:
+    """
+    Apply func to every item, yielding results in input order.
+
+    With workers <= 1 everything runs in the calling process. Otherwise tasks
+    go to a pool, and at most max_in_flight items (default: 2 * workers) are
+    submitted or waiting to be yielded at any time, so a lazy items iterable
+    is consumed only as fast as results are used. initializer(*initargs)
+    runs once in every pool worker, e.g. to open per-worker resources.
+    """
+    if workers <= 1:
+        for item in items:
+            yield func(item)
+        return
+
+    if max_in_flight is None:
+        max_in_flight = 2 * workers
+
+    iterator = iter(items)
+    pending = {}
+    next_submit = 0
+    next_yield = 0
+    exhausted = False
+
+    with executor_cls(max_workers=workers, initializer=initializer, initargs=initargs) as executor:
+        while True:
+            while not exhausted and next_submit - next_yield < max_in_flight:
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    exhausted = True
+                    break
+                pending[next_submit] = executor.submit(func, item)
+                next_submit += 1
+
+            if next_yield == next_submit:
+                break
+
+            future = pending.pop(next_yield)
+            next_yield += 1
+            yield future.result()
+
+
+def queue_map(
+    func: Callable[[Any], Any],
+    items: Iterable[Any],
+    expand: Callable[[Any], Iterable[Any]],
+    workers: int = 1,
+    executor_cls: type[Executor] = ProcessPoolExecutor,
+) -> Iterator[Any]:
+    """
+    Apply func to every item of a work queue, yielding results as they
+    complete. The queue starts with items; expand(result) returns the new
+    items every result adds, so work discovered by a task is queued as soon
+    as that task is done, while independent tasks keep running.
+
+    With workers <= 1 everything runs in the calling process.
+    """
+    queue = deque(items)
+
+    if workers <= 1:
+        while queue:
+            result = func(queue.popleft())
+            queue.extend(expand(result))
+            yield result
+        return
+
+    with executor_cls(max_workers=workers) as executor:
+        running = set()
+        while queue or running:
+            while queue and len(running) < workers:
+                running.add(executor.submit(func, queue.popleft()))
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                queue.extend(expand(result))
+                yield result
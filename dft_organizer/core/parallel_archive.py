@@ -0,0 +1,233 @@
+import os
+import time
+from functools import partial
+from pathlib import Path
+from typing import Any, Optional
+
+from dft_organizer.core.file_policy import FilePolicy
+from dft_organizer.core.parallel import bounded_map, queue_map
+from dft_organizer.core.sevenzip import (
+    DEFAULT_PROFILE,
+    archive_roots,
+    compress_with_7z,
+    extract_7z,
+    write_archive,
+)
+from dft_organizer.core.walker import CALCULATION_MARKERS, walk_calculation_dirs
+
+
+# what gets its own archive: every calculation directory,
+# or every second-level AiiDA shard (root/xx/yy)
+ARCHIVE_UNITS = ("calculation", "shard")
+SHARD_DEPTH = 2
+
+
+def unit_archive_path(unit_dir: Path) -> Path:
+    return unit_dir.with_name(f"{unit_dir.name}.7z")
+
+
+def archive_units(root_path: Path, unit: str = "calculation") -> list[Path]:
+    """Directories below root_path archived separately, in walk order"""
+    root_path = Path(root_path)
+    if unit == "shard":
+        return [
+            current_dir
+            for current_dir, _ in walk_calculation_dirs(root_path, max_depth=SHARD_DEPTH)
+            if len(current_dir.relative_to(root_path).parts) == SHARD_DEPTH
+        ]
+    if unit == "calculation":
+        return [
+            current_dir
+            for current_dir, filenames in walk_calculation_dirs(root_path, prune_calculations=True)
+            if any(marker in filenames for marker in CALCULATION_MARKERS)
+        ]
+    raise ValueError(f"Unknown archive unit: {unit}")
+
+
+def _compress_unit(
+    unit_dir: Path,
+    profile: str = DEFAULT_PROFILE,
+    file_policy: Optional[FilePolicy] = None,
+    backend: str = "auto",
+    threads: Optional[int] = None,
+) -> dict[str, Any]:
+    """Archive one unit next to it; runs in worker processes"""
+    archive_path = unit_archive_path(unit_dir)
+    start = time.perf_counter()
+    try:
+        input_bytes = write_archive(
+            unit_dir,
+            archive_path,
+            profile=profile,
+            file_policy=file_policy,
+            backend=backend,
+            threads=threads,
+        )
+    except Exception as e:
+        archive_path.unlink(missing_ok=True)
+        return {"dir": unit_dir, "archive": None, "error": str(e)}
+    return {
+        "dir": unit_dir,
+        "archive": archive_path,
+        "input_bytes": input_bytes,
+        "output_bytes": archive_path.stat().st_size,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def _throughput(input_bytes: int, seconds: float) -> float:
+    return input_bytes / 1024**2 / seconds if seconds > 0 else float("inf")
+
+
+def compress_units(
+    root_path: Path,
+    unit: str = "calculation",
+    workers: int = 1,
+    bundle: bool = True,
+    bundle_path: Optional[Path] = None,
+    profile: str = DEFAULT_PROFILE,
+    file_policy: Optional[FilePolicy] = None,
+    backend: str = "auto",
+) -> bool:
+    """
+    Archive every calculation directory (or AiiDA xx/yy shard) into its own
+    <dir>.7z next to it, workers archives at a time, printing progress and
+    per-archive throughput; profile names the COMPRESSION_PROFILES entry,
+    file_policy optionally stores or lightly compresses binary files and
+    backend picks the archiver (see sevenzip.get_backend). With several
+    workers every 7-Zip process compresses single-threaded.
+    With bundle, the tree is then archived into bundle_path (default
+    <root>.7z next to root) with the unit archives in place of the unit
+    directories, and the unit archives are removed; dft-unpack restores
+    the nested archives. Returns True if all succeeded.
+    """
+    root_path = Path(root_path).resolve()
+    units = archive_units(root_path, unit)
+    print(f"Archiving {len(units)} {unit} directories of {root_path} with {workers} workers...")
+
+    done = []
+    failed = []
+    total_input = total_output = 0
+    start = time.perf_counter()
+
+    results = bounded_map(
+        partial(
+            _compress_unit,
+            profile=profile,
+            file_policy=file_policy,
+            backend=backend,
+            threads=1 if workers > 1 else None,
+        ),
+        units,
+        workers=workers,
+    )
+    for i, result in enumerate(results, 1):
+        rel = result["dir"].relative_to(root_path)
+        if result["archive"] is None:
+            failed.append(result["dir"])
+            print(f"[{i}/{len(units)}] {rel}: failed: {result['error']}")
+            continue
+        done.append(result)
+        total_input += result["input_bytes"]
+        total_output += result["output_bytes"]
+        print(
+            f"[{i}/{len(units)}] {rel}: {result['input_bytes'] / 1024**2:.1f} MB -> "
+            f"{result['output_bytes'] / 1024**2:.1f} MB in {result['seconds']:.1f} s "
+            f"({_throughput(result['input_bytes'], result['seconds']):.1f} MB/s)"
+        )
+
+    elapsed = time.perf_counter() - start
+    print(
+        f"Archived {len(done)}/{len(units)} directories: {total_input / 1024**2:.1f} MB -> "
+        f"{total_output / 1024**2:.1f} MB in {elapsed:.1f} s "
+        f"({_throughput(total_input, elapsed):.1f} MB/s)"
+    )
+    if failed:
+        print(f"Failed: {', '.join(str(d) for d in failed)}")
+
+    if not bundle:
+        return not failed
+
+    if bundle_path is None:
+        bundle_path = root_path.parent / f"{root_path.name}.7z"
+    # unit directories that failed go into the bundle as they are
+    archived_dirs = [result["dir"] for result in done]
+    ok = compress_with_7z(
+        root_path,
+        bundle_path,
+        exclude=archived_dirs,
+        profile=profile,
+        file_policy=file_policy,
+        backend=backend,
+    )
+    if ok:
+        for result in done:
+            result["archive"].unlink()
+    return ok and not failed
+
+
+def find_archives(path: Path) -> list[Path]:
+    """.7z files at or below path"""
+    path = Path(path)
+    if path.is_file():
+        return [path] if path.suffix == ".7z" else []
+    archives = []
+    for current, dirnames, filenames in os.walk(path):
+        dirnames.sort()
+        archives.extend(Path(current) / name for name in sorted(filenames) if name.endswith(".7z"))
+    return archives
+
+
+def _extract_archive(archive_path: Path, backend: str = "auto") -> dict[str, Any]:
+    """
+    Extract an archive next to it and remove it; runs in worker processes.
+    Only the entries the archive produced are searched for nested archives.
+    """
+    target_dir = archive_path.parent
+    try:
+        roots = archive_roots(archive_path, backend)
+    except Exception as e:
+        print(f"Cannot read {archive_path}: {e}")
+        return {"archive": archive_path, "ok": False, "nested": []}
+
+    if not extract_7z(archive_path, target_dir, backend):
+        return {"archive": archive_path, "ok": False, "nested": []}
+    archive_path.unlink()
+
+    nested = [archive for root in roots for archive in find_archives(target_dir / root)]
+    return {"archive": archive_path, "ok": True, "nested": nested}
+
+
+def extract_nested_archives(root_path: Path, workers: int = 1, backend: str = "auto") -> bool:
+    """
+    Extract every .7z archive below root_path in place, including the
+    archives they contain, with up to workers extractions in parallel.
+    root_path is searched once; after that only the directories an
+    extraction produced are searched for further archives, which are
+    queued right away. Failed archives are kept. Returns True if all
+    archives were extracted.
+    """
+    root_path = Path(root_path)
+    archives = find_archives(root_path)
+    print(f"Found archives: {len(archives)}")
+
+    extracted = 0
+    failed = []
+    results = queue_map(
+        partial(_extract_archive, backend=backend),
+        archives,
+        lambda result: result["nested"],
+        workers=workers,
+    )
+    for result in results:
+        rel = result["archive"].relative_to(root_path)
+        if not result["ok"]:
+            failed.append(result["archive"])
+            print(f"  Skipping: failed to extract {rel}")
+            continue
+        extracted += 1
+        nested = f", {len(result['nested'])} nested archives queued" if result["nested"] else ""
+        print(f"  Extracted: {rel}{nested}")
+
+    print(f"Extracted {extracted} archives" + (f", {len(failed)} failed" if failed else ""))
+    return not failed
@@ -1,35 +1,61 @@
-import os
 from datetime import datetime
+from functools import partial
 from pathlib import Path
-from typing import Any
+from typing import Any, Optional
 import math
+from multiprocessing.util import Finalize
 
-import json
 import polars as pl
 
 from aiida import load_profile as load_aiida_profile
 from aiida.orm import load_node, StructureData
 import pg8000
-import numpy as np
 
 from dft_organizer.aiida_utils import extract_uuid_from_path
-from dft_organizer.utils import detect_engine, get_table_string
+from dft_organizer.ase_utils import displacement_metrics
+from dft_organizer.core.manifest import (
+    CalculationManifest,
+    directory_fingerprint,
+    manifest_path,
+)
+from dft_organizer.core.parallel import bounded_map
+from dft_organizer.core.schema import (
+    SummaryColumns,
+    summary_frame,
+    summary_path,
+    write_summary,
+)
+from dft_organizer.core.summary_writer import SummaryWriter
+from dft_organizer.core.trajectories import ScfTrajectoryWriter, scf_columns, scf_trajectory
+from dft_organizer.core.uuid_index import (
+    UUID_DEPTH,
+    UuidIndex,
+    dashed_uuid,
+    normalize_uuid,
+    uuid_candidates,
+)
+from dft_organizer.core.walker import walk_calculation_dirs
+from dft_organizer.parse_cache import ParseCache
+from dft_organizer.utils import (
+    detect_engine,
+    detect_engine_by_filenames,
+    get_table_string,
+    parse_crystal_output_cached,
+    parse_fleur_output_cached,
+)
 from dft_organizer.crystal_parser import (
-    parse_crystal_output,
     make_report as make_report_crystal,
     print_report as print_report_crystal,
     save_report as save_report_crystal,
 )
 from dft_organizer.fleur_parser import (
-    parse_fleur_output,
     make_report as make_report_fleur,
     print_report as print_report_fleur,
     save_report as save_report_fleur,
 )
 from dft_organizer.aiida.aiida_links_tree import (
+    fetch_first_last_structure_uuids,
     load_db_config,
-    fetch_tree_from_db,
-    find_first_last_structure_uuids,
 )
 
 
@@ -46,80 +72,217 @@ def _get_structure_from_uuid(uuid: str) -> StructureData:
 
 
 def structure_displacement_ase(atoms_init, atoms_final) -> dict:
-    pos_init = atoms_init.get_positions()
-    pos_final = atoms_final.get_positions()
-    if pos_init.shape != pos_final.shape:
-        raise ValueError("Initial and final structures have different sizes/order")
-    disp = pos_final - pos_init
-    sq = np.sum(disp**2, axis=1)
-    sum_sq = float(np.sum(sq))
-    rmsd = float(np.sqrt(np.mean(sq)))
-    return {"sum_sq_disp": sum_sq, "rmsd_disp": rmsd}
+    """Displacement metrics with the minimum image, as for local FLEUR files"""
+    return displacement_metrics(atoms_init, atoms_final)
+
+
+def _has_displacement(summary: dict[str, Any]) -> bool:
+    value = summary.get("rmsd_disp")
+    return isinstance(value, (int, float)) and math.isfinite(value)
 
 
 def enrich_fleur_with_displacement(summary_store: list[dict[str, Any]]) -> None:
     """
-    For each summary with engine='fleur' ​​and field 'uuid' (CalcJobNode FLEUR):
-    - Builds a tree around the CalcJob;
-    - Finds the first and last StructureData by pk;
-    - Calculates the coordinate offset between them;
-    - Adds to the summary:
-    'first_struct_uuid', 'last_struct_uuid',
-    'sum_sq_disp', 'rmsd_disp',
+    For each summary with engine='fleur' and field 'uuid' (CalcJobNode FLEUR):
+    - Finds the first and last StructureData by pk in the provenance tree
+      around the CalcJob, for all summaries in one database query;
+    - Adds 'first_struct_uuid' and 'last_struct_uuid' to the summary;
+    - Unless the displacement was already computed from the local
+      inp.xml / relax.xml, sets 'sum_sq_disp' and 'rmsd_disp' to the
+      coordinate offset between those two structures.
     Modifies summary_store in-place.
     """
-    load_aiida_profile()
+    to_enrich = [
+        summary
+        for summary in summary_store
+        if summary.get("engine") == "fleur" and summary.get("uuid")
+    ]
+    if not to_enrich:
+        return
+
     db_cfg = load_db_config()
     conn = pg8000.connect(**db_cfg)
-
     try:
-        for summary in summary_store:
-            if summary.get("engine") != "fleur":
-                continue
-            calc_uuid = summary.get("uuid")
-            if not calc_uuid:
-                continue
+        structures = fetch_first_last_structure_uuids(
+            conn, [dashed_uuid(summary["uuid"]) for summary in to_enrich]
+        )
+    except Exception as e:
+        print(f"Cannot query provenance trees: {e}")
+        structures = {}
+    finally:
+        conn.close()
 
-            summary["first_struct_uuid"] = None
-            summary["last_struct_uuid"] = None
-            summary["sum_sq_disp"] = None
-            summary["rmsd_disp"] = None
+    profile_loaded = False
+    for summary in to_enrich:
+        calc_uuid = summary["uuid"]
+        first_s_uuid, last_s_uuid = structures.get(dashed_uuid(calc_uuid), (None, None))
+        summary["first_struct_uuid"] = first_s_uuid
+        summary["last_struct_uuid"] = last_s_uuid
 
-            try:
-                calc = load_node(calc_uuid)
-            except Exception as e:
-                print(f"Cannot load CalcJobNode {calc_uuid}: {e}")
-                continue
+        if _has_displacement(summary):
+            continue
+        summary["sum_sq_disp"] = None
+        summary["rmsd_disp"] = None
+        if first_s_uuid is None or last_s_uuid is None:
+            continue
 
-            start_pk = calc.pk
+        if not profile_loaded:
+            load_aiida_profile()
+            profile_loaded = True
+        try:
+            first_struct = _get_structure_from_uuid(first_s_uuid)
+            last_struct = _get_structure_from_uuid(last_s_uuid)
+            ase_first = first_struct.get_ase()
+            ase_last = last_struct.get_ase()
+            disp = structure_displacement_ase(ase_first, ase_last)
+            summary["sum_sq_disp"] = round(disp["sum_sq_disp"], 2)
+            summary["rmsd_disp"]   = round(disp["rmsd_disp"], 2)
+        except Exception as e:
+            print(f"Cannot compute displacement for CalcJob {calc_uuid}: {e}")
+            continue
 
-            try:
-                links = fetch_tree_from_db(conn, start_pk)
-                first_s_uuid, last_s_uuid = find_first_last_structure_uuids(links)
-            except Exception as e:
-                print(f"Cannot build provenance tree for pk={start_pk}: {e}")
-                continue
 
-            if first_s_uuid is None or last_s_uuid is None:
-                continue
+# parse cache of a scan worker process, set up once by _init_scan_worker
+_worker_parse_cache: Optional[ParseCache] = None
 
-            summary["first_struct_uuid"] = first_s_uuid
-            summary["last_struct_uuid"] = last_s_uuid
-
-            try:
-                first_struct = _get_structure_from_uuid(first_s_uuid)
-                last_struct = _get_structure_from_uuid(last_s_uuid)
-                ase_first = first_struct.get_ase()
-                ase_last = last_struct.get_ase()
-                disp = structure_displacement_ase(ase_first, ase_last)
-                summary["sum_sq_disp"] = round(disp["sum_sq_disp"], 2)
-                summary["rmsd_disp"]   = round(disp["rmsd_disp"], 2)
-            except Exception as e:
-                print(f"Cannot compute displacement for CalcJob {calc_uuid}: {e}")
-                continue
 
-    finally:
-        conn.close()
+def _init_scan_worker(parse_cache: Optional[ParseCache]) -> None:
+    """
+    Pool initializer: keep the worker's copy of the parse cache, so its
+    SQLite connection is opened once per worker and closed at worker exit
+    """
+    global _worker_parse_cache
+    _worker_parse_cache = parse_cache
+    if parse_cache is not None:
+        Finalize(parse_cache, parse_cache.close, exitpriority=10)
+
+
+def _scan_directory(
+    task: tuple[Path, list[str], Optional[str], Optional[dict]],
+    fast_detect: bool = False,
+    parse_cache: Optional[ParseCache] = None,
+    fast_crystal: bool = False,
+    scf_trajectories: bool = False,
+) -> dict[str, Any]:
+    """
+    Detect the engine of a single directory, parse its output and collect
+    error messages. Runs in worker processes, so it must stay picklable.
+    A result cached in the manifest is returned with its SCF trajectory
+    and output path rebuilt from current_dir. Without parse_cache
+    the worker's cache from _init_scan_worker is used, if any.
+    With scf_trajectories the per-iteration SCF arrays are returned as "scf"
+    and their derived columns added to the summary.
+    """
+    current_dir, filenames, fingerprint, cached = task
+    if cached is not None:
+        result = {**cached, "dir": current_dir, "fingerprint": fingerprint, "cached": True}
+        if result["summary"] is not None:
+            # stored relative to the root, which may have moved since
+            summary = result["summary"]
+            summary["output_path"] = str(current_dir / Path(summary["output_path"]).name)
+        return result
+
+    if parse_cache is None:
+        parse_cache = _worker_parse_cache
+    cache_hits = parse_cache.hits if parse_cache is not None else 0
+    cache_misses = parse_cache.misses if parse_cache is not None else 0
+
+    if fast_detect:
+        engine, detect_bytes = detect_engine_by_filenames(filenames, current_dir)
+    else:
+        engine, detect_bytes = detect_engine(filenames, current_dir), None
+
+    result: dict[str, Any] = {
+        "dir": current_dir,
+        "fingerprint": fingerprint,
+        "cached": False,
+        "engine": engine,
+        "detect_bytes": detect_bytes,
+        "summary": None,
+        "errors_crystal": [],
+        "errors_fleur": [],
+    }
+
+    if engine == "crystal" and "OUTPUT" in filenames:
+        output_path = current_dir / "OUTPUT"
+        summary = parse_crystal_output_cached(output_path, parse_cache, fast=fast_crystal)
+        summary["output_path"] = str(output_path)
+        summary["engine"] = engine
+        result["summary"] = summary
+    elif engine == "fleur" and ("out" in filenames or "out.xml" in filenames):
+        output_path = current_dir / ("out.xml" if "out.xml" in filenames else "out")
+        summary = parse_fleur_output_cached(output_path, parse_cache)
+        summary["output_path"] = str(output_path)
+        summary["engine"] = engine
+        result["summary"] = summary
+
+    if scf_trajectories and result["summary"] is not None:
+        summary = result["summary"]
+        result["scf"] = scf_trajectory(Path(summary["output_path"]), engine)
+        summary.update(scf_columns(result["scf"]))
+
+    if engine == "crystal":
+        result["errors_crystal"] = list(make_report_crystal(current_dir, filenames, {}))
+    elif engine == "fleur":
+        result["errors_fleur"] = list(make_report_fleur(current_dir, filenames, {}))
+
+    if parse_cache is not None:
+        result["cache_hits"] = parse_cache.hits - cache_hits
+        result["cache_misses"] = parse_cache.misses - cache_misses
+
+    return result
+
+
+# scan result fields cached in the manifest
+_MANIFEST_KEYS = ("engine", "detect_bytes", "summary", "errors_crystal", "errors_fleur")
+
+
+def _manifest_entry(result: dict[str, Any], root_path: Path) -> dict[str, Any]:
+    """Scan result as cached in the manifest, with the output path relative to the root"""
+    entry = {key: result[key] for key in _MANIFEST_KEYS}
+    summary = entry["summary"]
+    if summary is not None:
+        output_path = Path(summary["output_path"]).relative_to(root_path).as_posix()
+        entry["summary"] = {**summary, "output_path": output_path}
+    if "scf" in result:
+        scf = result["scf"]
+        entry["scf"] = None if scf is None else {name: values.tolist() for name, values in scf.items()}
+    return entry
+
+
+def _keep_summary(
+    summary: dict[str, Any], skip_errors: bool, calculation_type: str
+) -> bool:
+    """Decide whether a parsed calculation goes to the summary and error reports"""
+    if summary["engine"] == "crystal" and calculation_type == "structure_opt":
+        if summary.get("optgeom") is not True:
+            return False
+    if skip_errors and math.isnan(summary.get("duration", float("nan"))):
+        return False
+    return True
+
+
+def _iter_scan_tasks(
+    root_path: Path,
+    manifest: Optional[CalculationManifest],
+    options: dict,
+    walk_options: dict,
+):
+    """Attach the manifest fingerprint and cached result to every directory"""
+    for current_dir, filenames in walk_calculation_dirs(root_path, **walk_options):
+        fingerprint = cached = None
+        if manifest is not None:
+            fingerprint = directory_fingerprint(current_dir, filenames, options)
+            cached = manifest.lookup(current_dir.relative_to(root_path).as_posix(), fingerprint)
+            # entries written before SCF trajectories were cached lack them
+            if (
+                cached is not None
+                and options["scf_trajectories"]
+                and cached["summary"] is not None
+                and "scf" not in cached
+            ):
+                cached = None
+        yield current_dir, filenames, fingerprint, cached
 
 
 def scan_calculations(
@@ -127,8 +290,18 @@ def scan_calculations(
     aiida: bool = False,
     verbose: bool = True,
     skip_errors: bool = False,
-    calculation_type: str = "structure_opt"
-) -> tuple[list[dict[str, Any]], dict, dict]:
+    calculation_type: str = "structure_opt",
+    workers: int = 1,
+    fast_detect: bool = False,
+    incremental: bool = False,
+    parse_cache: Optional[ParseCache] = None,
+    summary_writer: Optional[SummaryWriter] = None,
+    max_depth: Optional[int] = None,
+    ignore: tuple[str, ...] = (),
+    prune_calculations: bool = False,
+    fast_crystal: bool = False,
+    scf_writer: Optional[ScfTrajectoryWriter] = None,
+) -> tuple[SummaryColumns, dict, dict]:
     """
     Go through directory tree, parse outputs and generate error reports.
 
@@ -137,135 +310,226 @@ def scan_calculations(
     - aiida: Whether to extract UUIDs based on AiiDA path structure.
     - verbose: Whether to print summaries to stdout.
     - skip_errors: Whether to skip entries with parsing errors in the summary.
+    - workers: Number of processes parsing directories in parallel;
+      results are merged in walk order, so the output matches a serial run.
+    - fast_detect: Detect engines from file names, sniffing at most one
+      header per directory, instead of reading every file.
+    - incremental: Keep a manifest next to root_dir and re-parse only
+      directories whose tracked files changed since the previous scan.
+    - parse_cache: Cache of parser results keyed by output file content.
+    - summary_writer: Write summaries in batches as they are produced
+      instead of returning them; the returned summary columns are then empty.
+    - max_depth: Do not look for calculations deeper than this below root_dir.
+    - ignore: Glob patterns of directories to skip (names or relative paths).
+    - prune_calculations: Do not descend into directories that already
+      contain a calculation output.
+    - fast_crystal: Parse CRYSTAL outputs with the summary-only fast path,
+      falling back to the full pycrystal parser when it cannot decide.
+    - scf_writer: Extract the per-iteration SCF energies, deltas and Fermi
+      levels of every kept calculation into this sidecar and add the
+      scf_iterations and scf_final_delta columns.
     """
     root_path = Path(root_dir).resolve()
 
-    summary_store: list[dict[str, Any]] = []
+    summary_store = SummaryColumns()
     error_dict_crystal: dict = {}
     error_dict_fleur: dict = {}
+    detect_bytes = 0
+    scanned_dirs = 0
+    cache_hits = cache_misses = 0
+    pending: list[dict[str, Any]] = []
+    scf_pending: list[dict[str, Any]] = []
+
+    def flush_pending():
+        if aiida and pending:
+            enrich_fleur_with_displacement(pending)
+        if summary_writer is not None:
+            summary_writer.write_rows(pending)
+        else:
+            summary_store.extend(pending)
+        pending.clear()
+        if scf_writer is not None:
+            scf_writer.write_rows(scf_pending)
+        scf_pending.clear()
+
+    manifest = CalculationManifest(manifest_path(root_path)) if incremental else None
+    uuid_index = UuidIndex(root_path) if aiida else None
+    scf_trajectories = scf_writer is not None
+    options = {
+        "fast_detect": fast_detect,
+        "fast_crystal": fast_crystal,
+        "scf_trajectories": scf_trajectories,
+    }
+    walk_options = {
+        "max_depth": max_depth,
+        "ignore": ignore,
+        "prune_calculations": prune_calculations,
+    }
 
-    for dirpath, dirnames, filenames in os.walk(root_path, topdown=False):
-        current_dir = Path(dirpath)
-        if current_dir == root_path:
-            continue
+    try:
+        for result in bounded_map(
+            partial(
+                _scan_directory,
+                fast_detect=fast_detect,
+                parse_cache=parse_cache if workers <= 1 else None,
+                fast_crystal=fast_crystal,
+                scf_trajectories=scf_trajectories,
+            ),
+            _iter_scan_tasks(root_path, manifest, options, walk_options),
+            workers=workers,
+            initializer=_init_scan_worker,
+            initargs=(parse_cache,),
+        ):
+            current_dir = result["dir"]
+            summary = result["summary"]
+            scanned_dirs += 1
+            if result["detect_bytes"] is not None and not result["cached"]:
+                detect_bytes += result["detect_bytes"]
+            cache_hits += result.get("cache_hits", 0)
+            cache_misses += result.get("cache_misses", 0)
+
+            if manifest is not None and not result["cached"]:
+                manifest.store(
+                    current_dir.relative_to(root_path).as_posix(),
+                    result["fingerprint"],
+                    _manifest_entry(result, root_path),
+                )
+
+            if summary is not None and uuid_index is not None:
+                # outputs below the shard directory belong to its UUID,
+                # which keeps pointing at the shard directory itself
+                parts = current_dir.relative_to(root_path).parts
+                if len(parts) >= UUID_DEPTH:
+                    uuid_dir = root_path.joinpath(*parts[:UUID_DEPTH])
+                    uuid_index.add(extract_uuid_from_path(uuid_dir, root_path), uuid_dir)
+
+            if summary is not None:
+                if not _keep_summary(summary, skip_errors, calculation_type):
+                    continue
+                if aiida:
+                    uuid = extract_uuid_from_path(Path(summary["output_path"]), root_path)
+                    summary["uuid"] = uuid
+                pending.append(summary)
+                if result.get("scf") is not None:
+                    scf_pending.append(
+                        {
+                            "output_path": summary["output_path"],
+                            "engine": summary["engine"],
+                            **result["scf"],
+                        }
+                    )
+                if (summary_writer is not None and len(pending) >= summary_writer.batch_size) or (
+                    scf_writer is not None and len(scf_pending) >= scf_writer.batch_size
+                ):
+                    flush_pending()
+                if verbose:
+                    print(f"{summary['engine'].upper()} OUTPUT FOUND IN {summary['output_path']}")
+                    print(get_table_string(summary))
+
+            for error in result["errors_crystal"]:
+                error_dict_crystal.setdefault(error, []).append(current_dir)
+            for error in result["errors_fleur"]:
+                error_dict_fleur.setdefault(error, []).append(current_dir)
+
+        flush_pending()
+        if manifest is not None:
+            removed = manifest.prune()
+    finally:
+        if manifest is not None:
+            manifest.close()
+        if uuid_index is not None:
+            uuid_index.close()
 
-        engine = detect_engine(filenames, current_dir)
+    if verbose and fast_detect:
+        print(f"Engine detection read {detect_bytes} bytes in {scanned_dirs} directories")
 
-        if engine == "crystal" and "OUTPUT" in filenames:
-            output_path = current_dir / "OUTPUT"
-            summary = parse_crystal_output(output_path)
+    if parse_cache is not None and verbose:
+        print(f"Parse cache {parse_cache.path}: {cache_hits} hits, {cache_misses} misses")
 
-            if summary.get("optgeom") and calculation_type == "structure_opt":
-                if summary.get("optgeom") is True:
-                    pass
-                else:
-                    continue
-            elif calculation_type == "structure_opt":
-                continue
+    if manifest is not None and verbose:
+        print(
+            f"Manifest {manifest.path}: {manifest.reused} reused, "
+            f"{manifest.parsed} parsed, {removed} removed"
+        )
 
-            summary["output_path"] = str(output_path)
-            summary["engine"] = engine
-            if aiida:
-                uuid = extract_uuid_from_path(output_path, root_path)
-                summary["uuid"] = uuid
-            if skip_errors and math.isnan(summary.get('duration', float('nan'))):
-                continue
-            summary_store.append(summary)
-            if verbose:
-                print(f"{engine.upper()} OUTPUT FOUND IN {output_path}")
-                print(get_table_string(summary))
-
-        elif engine == "fleur" and ("out" in filenames or "out.xml" in filenames):
-            output_path = current_dir / ("out.xml" if "out.xml" in filenames else "out")
-            summary = parse_fleur_output(output_path)
-            summary["output_path"] = str(output_path)
-            summary["engine"] = engine
-            if aiida:
-                uuid = extract_uuid_from_path(output_path, root_path)
-                summary["uuid"] = uuid
-            if skip_errors and math.isnan(summary.get('duration', float('nan'))):
-                continue
-            summary_store.append(summary)
-            if verbose:
-                print(f"{engine.upper()} OUTPUT FOUND IN {output_path}")
-                print(get_table_string(summary))
+    return summary_store, error_dict_crystal, error_dict_fleur
 
-        if engine == "crystal":
-            error_dict_crystal = make_report_crystal(
-                current_dir, filenames, error_dict_crystal
-            )
-        elif engine == "fleur":
-            error_dict_fleur = make_report_fleur(
-                current_dir, filenames, error_dict_fleur
-            )
 
-    if aiida and summary_store:
-        enrich_fleur_with_displacement(summary_store)
+def _index_uuid_tree(root_path: Path, uuid_index: UuidIndex, uuid: Optional[str] = None):
+    """
+    Walk the shard directories of root_path into the index; with uuid,
+    stop at its directory and return it.
+    """
+    for current_dir, _ in walk_calculation_dirs(root_path, max_depth=UUID_DEPTH):
+        if len(current_dir.relative_to(root_path).parts) != UUID_DEPTH:
+            continue
+        extracted_uuid = extract_uuid_from_path(current_dir, root_path)
+        uuid_index.add(extracted_uuid, current_dir)
+        if uuid is not None and normalize_uuid(extracted_uuid) == normalize_uuid(uuid):
+            return current_dir
+    return None
 
-    return summary_store, error_dict_crystal, error_dict_fleur
+
+def _lookup_uuid(root_path: Path, uuid: str, uuid_index: UuidIndex) -> Optional[Path]:
+    """Sharded xx/yy/rest path of the UUID, with or without dashes, or its index entry"""
+    for candidate in uuid_candidates(uuid):
+        expected_path = root_path / candidate
+        if expected_path.exists():
+            return expected_path
+    return uuid_index.lookup(uuid)
 
 
-def find_calculation_by_uuid(root_dir: Path, uuid: str) -> Path:
-    """Find calculation directory by UUID in AiiDA structure"""
+def find_calculation_by_uuid(
+    root_dir: Path, uuid: str, uuid_index: Optional[UuidIndex] = None
+) -> Path:
+    """
+    Find calculation directory by UUID in AiiDA structure.
+    Tries the sharded xx/yy/rest path, then the UUID index written by scans,
+    and only then walks the tree, indexing every UUID met on the way.
+    Dashes and case in uuid do not matter.
+    """
     root_path = Path(root_dir).resolve()
 
     if not root_path.exists():
         raise FileNotFoundError(f"Directory does not exist: {root_path}")
 
-    if len(uuid) < 4:
+    if len(normalize_uuid(uuid)) < 4:
         raise ValueError(f"UUID too short: {uuid}")
 
-    first_dir = uuid[:2]
-    second_dir = uuid[2:4]
-    calc_dir = uuid[4:]
-
-    expected_path = root_path / first_dir / second_dir / calc_dir
-
-    if expected_path.exists():
-        return expected_path
-
-    for dirpath, dirnames, filenames in os.walk(root_path):
-        current_dir = Path(dirpath)
-        extracted_uuid = extract_uuid_from_path(current_dir, root_path)
-        if extracted_uuid == uuid:
-            return current_dir
+    own_index = uuid_index is None
+    if own_index:
+        uuid_index = UuidIndex(root_path)
+    try:
+        found = _lookup_uuid(root_path, uuid, uuid_index)
+        if found is None:
+            found = _index_uuid_tree(root_path, uuid_index, uuid)
+    finally:
+        if own_index:
+            uuid_index.close()
 
-    raise FileNotFoundError(f"Calculation with UUID {uuid} not found in {root_path}")
+    if found is None:
+        raise FileNotFoundError(f"Calculation with UUID {uuid} not found in {root_path}")
+    return found
 
 
 def save_reports(
     root_path: Path,
-    summary_store: list[dict],
+    summary_store: SummaryColumns,
     error_dict_crystal: dict,
     error_dict_fleur: dict,
+    time_now: Optional[str] = None,
+    summary_format: str = "csv",
 ) -> None:
-    time_now = datetime.now().strftime("%Y_%m_%d_%H_%M_%S")
-
-    def _serialize_nested(v):
-        if v is None:
-            return ""
-        return json.dumps(v)
+    if time_now is None:
+        time_now = datetime.now().strftime("%Y_%m_%d_%H_%M_%S")
 
     if summary_store:
-        nested_keys = ["cell", "positions", "pbc", "numbers", "symbols", "bandgap"]
-        flat_summary = []
-
-        for row in summary_store:
-            try:
-                row = dict(row)
-                for k in nested_keys:
-                    if k in row:
-                        try:
-                            row[k] = _serialize_nested(row[k])
-                        except Exception:
-                            row[k] = None
-                flat_summary.append(row)
-            except Exception:
-                continue
-
-        if flat_summary:
-            df = pl.DataFrame(flat_summary)
-            df.write_csv(root_path.parent / f"summary_{time_now}.csv")
+        df = summary_frame(summary_store, summary_format)
+        write_summary(
+            df,
+            summary_path(root_path.parent, f"summary_{time_now}", summary_format),
+            summary_format,
+        )
 
     if error_dict_fleur:
         print_report_fleur(error_dict_fleur)
@@ -282,49 +546,74 @@ def save_reports(
         )
 
 
-def generate_report_for_uuid(root_dir: Path, uuid: str) -> dict:
+def _report_uuid_calculation(
+    calc_dir: Path,
+    uuid: str,
+    error_dict_crystal: dict,
+    error_dict_fleur: dict,
+    parse_cache: Optional[ParseCache] = None,
+) -> Optional[tuple[str, dict]]:
+    """
+    Parse the calculation of a UUID and add its errors to the error dict
+    of its engine. Returns the engine and the summary.
+    """
+    filenames = [f.name for f in calc_dir.iterdir() if f.is_file()]
+
+    engine = detect_engine(filenames, calc_dir)
+
+    if engine == "crystal":
+        make_report_crystal(str(calc_dir), filenames, error_dict_crystal)
+        output_file = calc_dir / "OUTPUT"
+        parse_output = parse_crystal_output_cached
+    elif engine == "fleur":
+        make_report_fleur(str(calc_dir), filenames, error_dict_fleur)
+        output_file = calc_dir / "out"
+        parse_output = parse_fleur_output_cached
+    else:
+        print(f"Unknown engine detected for {calc_dir}")
+        return None
+
+    if output_file.exists():
+        summary = parse_output(output_file, parse_cache)
+        summary["output_path"] = str(output_file)
+        summary["uuid"] = uuid
+        summary["engine"] = engine
+    else:
+        print(f"Output file not found in {calc_dir}")
+        summary = {
+            "output_path": str(calc_dir),
+            "uuid": uuid,
+            "engine": engine,
+            "error": "Output file not found",
+        }
+    return engine, summary
+
+
+def generate_report_for_uuid(
+    root_dir: Path, uuid: str, parse_cache: Optional[ParseCache] = None
+) -> dict:
     """Generate report for a specific calculation by UUID"""
     try:
         calc_dir = find_calculation_by_uuid(root_dir, uuid)
         print(f"Found calculation at: {calc_dir}")
 
-        filenames = [f.name for f in calc_dir.iterdir() if f.is_file()]
-
-        error_dict = {}
-
-        engine = detect_engine(filenames, calc_dir)
+        error_dict_crystal: dict = {}
+        error_dict_fleur: dict = {}
+        found = _report_uuid_calculation(
+            calc_dir, uuid, error_dict_crystal, error_dict_fleur, parse_cache
+        )
+        if found is None:
+            return None
+        engine, summary = found
 
         if engine == "crystal":
-            error_dict = make_report_crystal(str(calc_dir), filenames, {})
-            output_file = calc_dir / "OUTPUT"
-            parse_output = parse_crystal_output
+            error_dict = error_dict_crystal
             print_report = print_report_crystal
             save_report = save_report_crystal
-        elif engine == "fleur":
-            error_dict = make_report_fleur(str(calc_dir), filenames, {})
-            output_file = calc_dir / "out"
-            parse_output = parse_fleur_output
+        else:
+            error_dict = error_dict_fleur
             print_report = print_report_fleur
             save_report = save_report_fleur
-        else:
-            print(f"Unknown engine detected for {calc_dir}")
-            return None
-
-        summary = None
-
-        if output_file.exists():
-            summary = parse_output(output_file)
-            summary["output_path"] = str(output_file)
-            summary["uuid"] = uuid
-            summary["engine"] = engine
-        else:
-            print(f"Output file not found in {calc_dir}")
-            summary = {
-                "output_path": str(calc_dir),
-                "uuid": uuid,
-                "engine": engine,
-                "error": "Output file not found",
-            }
 
         print("\n" + "=" * 60)
         print(f"CALCULATION REPORT FOR UUID: {uuid}")
@@ -362,10 +651,92 @@ def generate_report_for_uuid(root_dir: Path, uuid: str) -> dict:
         return None
 
 
-def generate_reports_only(root_dir: Path, aiida: bool = False, skip_errors: bool = False, calculation_type: str = "structure_opt") -> None:
+def read_uuid_file(uuid_file: Path) -> list[str]:
+    """UUIDs from a text file, one per line; dashes, blanks and # comments are dropped"""
+    uuids = []
+    with open(uuid_file, "r") as f:
+        for line in f:
+            uuid = line.split("#", 1)[0].strip().replace("-", "")
+            if uuid and uuid not in uuids:
+                uuids.append(uuid)
+    return uuids
+
+
+def generate_reports_for_uuids(
+    root_dir: Path,
+    uuids: list[str],
+    parse_cache: Optional[ParseCache] = None,
+    summary_format: str = "csv",
+) -> SummaryColumns:
+    """
+    Generate one combined summary and error report for a batch of UUIDs.
+    UUIDs not found by path or in the UUID index are resolved after
+    indexing the whole tree once.
+    """
+    root_path = Path(root_dir).resolve()
+    summary_store = SummaryColumns()
+    error_dict_crystal: dict = {}
+    error_dict_fleur: dict = {}
+    missing = []
+
+    with UuidIndex(root_path) as uuid_index:
+        calc_dirs = {}
+        for uuid in uuids:
+            if len(normalize_uuid(uuid)) < 4:
+                print(f"Error: UUID too short: {uuid}")
+                missing.append(uuid)
+                continue
+            calc_dirs[uuid] = _lookup_uuid(root_path, uuid, uuid_index)
+
+        if any(calc_dir is None for calc_dir in calc_dirs.values()):
+            _index_uuid_tree(root_path, uuid_index)
+            for uuid, calc_dir in calc_dirs.items():
+                if calc_dir is None:
+                    calc_dirs[uuid] = uuid_index.lookup(uuid)
+
+        for uuid, calc_dir in calc_dirs.items():
+            if calc_dir is None:
+                print(f"Error: Calculation with UUID {uuid} not found in {root_path}")
+                missing.append(uuid)
+                continue
+
+            found = _report_uuid_calculation(
+                calc_dir, uuid, error_dict_crystal, error_dict_fleur, parse_cache
+            )
+            if found is not None:
+                summary_store.append(found[1])
+
+    print(f"Reported {len(summary_store)} of {len(uuids)} UUIDs")
+    if missing:
+        print(f"Not found: {', '.join(missing)}")
+
+    save_reports(
+        root_path,
+        summary_store,
+        error_dict_crystal,
+        error_dict_fleur,
+        summary_format=summary_format,
+    )
+    return summary_store
+
+
+def generate_reports_only(
+    root_dir: Path,
+    aiida: bool = False,
+    skip_errors: bool = False,
+    calculation_type: str = "structure_opt",
+    workers: int = 1,
+    stream: bool = False,
+    summary_format: str = "csv",
+    scf_trajectories: bool = False,
+    **scan_options,
+) -> None:
     """
     Scan a calculation tree, print a short summary to stdout
-    and save a summary CSV plus error reports.
+    and save a summary (csv, parquet or ipc) plus error reports.
+    With stream=True summary rows are written in batches during the scan.
+    With scf_trajectories the SCF iterations go to scf_<time>.parquet.
+    Extra keyword arguments are passed to scan_calculations.
     """
     root_path = Path(root_dir).resolve()
     if not root_path.exists():
@@ -376,15 +747,38 @@ def generate_reports_only(root_dir: Path, aiida: bool = False, skip_errors: bool
     print("GENERATING REPORTS FOR ALL CALCULATIONS")
     print("=" * 60 + "\n")
 
+    time_now = datetime.now().strftime("%Y_%m_%d_%H_%M_%S")
+    summary_writer = None
+    if stream:
+        summary_writer = SummaryWriter(
+            summary_path(root_path.parent, f"summary_{time_now}", summary_format),
+            summary_format,
+        )
+    scf_writer = None
+    if scf_trajectories:
+        scf_writer = ScfTrajectoryWriter(
+            summary_path(root_path.parent, f"scf_{time_now}", "parquet")
+        )
+
     summary_store, err_cr, err_fl = scan_calculations(
         root_path,
         aiida=aiida,
         verbose=True,
         skip_errors=skip_errors,
-        calculation_type=calculation_type
+        calculation_type=calculation_type,
+        workers=workers,
+        summary_writer=summary_writer,
+        scf_writer=scf_writer,
+        **scan_options,
     )
 
-    save_reports(root_path, summary_store, err_cr, err_fl)
+    if summary_writer is not None:
+        summary_writer.close()
+    if scf_writer is not None and scf_writer.close() is not None:
+        print(f"SCF trajectories saved to: {scf_writer.path}")
+    save_reports(
+        root_path, summary_store, err_cr, err_fl, time_now=time_now, summary_format=summary_format
+    )
 
     print("\n" + "=" * 60)
     print("REPORTS GENERATION COMPLETE")
@@ -0,0 +1,173 @@
+import json
+import math
+from pathlib import Path
+from typing import Any, Iterable
+
+import numpy as np
+import polars as pl
+
+from dft_organizer.crystal_parser.properties.electronic import ELECTRONIC_COLUMNS
+from dft_organizer.crystal_parser.properties.transport import transport_column_names
+
+
+SUMMARY_FORMATS = {"csv": ".csv", "parquet": ".parquet", "ipc": ".arrow"}
+
+# columns filled for both engines
+COMMON_COLUMNS = {
+    "engine": pl.Utf8,
+    "output_path": pl.Utf8,
+    "uuid": pl.Utf8,
+    "chemical_formula": pl.Utf8,
+    "duration": pl.Float64,
+    "bandgap": pl.Float64,
+    "a": pl.Float64,
+    "b": pl.Float64,
+    "c": pl.Float64,
+    "alpha": pl.Float64,
+    "beta": pl.Float64,
+    "gamma": pl.Float64,
+    "sum_sq_disp": pl.Float64,
+    "rmsd_disp": pl.Float64,
+    "cell": pl.List(pl.List(pl.Float64)),
+    "positions": pl.List(pl.List(pl.Float64)),
+    "symbols": pl.List(pl.Utf8),
+    "numbers": pl.List(pl.Int64),
+    "pbc": pl.List(pl.Boolean),
+    "scf_iterations": pl.Int64,
+    "scf_final_delta": pl.Float64,
+}
+
+CRYSTAL_COLUMNS = {
+    "techs_1_FMIXING": pl.Utf8,
+    "techs_2": pl.Utf8,
+    "optgeom": pl.Boolean,
+    "num_opt_cycles": pl.Int64,
+    "MAXCYCLE": pl.Utf8,
+    "TOLDEE": pl.Utf8,
+    "TOLLDENS": pl.Utf8,
+    "TOLLGRID": pl.Utf8,
+    "SHRINK": pl.Utf8,
+    "TOLINTEG": pl.Utf8,
+    "t1": pl.Utf8,
+    "t5": pl.Utf8,
+    "k": pl.Utf8,
+    "H": pl.Utf8,
+    "smear": pl.Float64,
+    "spin": pl.Float64,
+    "seebeck_avg": pl.Float64,
+    "temperature": pl.Float64,
+    **{name: pl.Float64 for name in transport_column_names()},
+    **{name: pl.Float64 for name in ELECTRONIC_COLUMNS},
+}
+
+FLEUR_COLUMNS = {
+    "first_struct_uuid": pl.Utf8,
+    "last_struct_uuid": pl.Utf8,
+}
+
+SUMMARY_SCHEMA = {**COMMON_COLUMNS, **CRYSTAL_COLUMNS, **FLEUR_COLUMNS}
+
+
+def summary_path(directory: Path, stem: str, fmt: str = "csv") -> Path:
+    if fmt not in SUMMARY_FORMATS:
+        raise ValueError(f"Unknown summary format: {fmt}")
+    return Path(directory) / f"{stem}{SUMMARY_FORMATS[fmt]}"
+
+
+def _coerce(value: Any, dtype) -> Any:
+    """Convert a parsed value to the declared column type, None if impossible"""
+    if isinstance(value, np.ndarray):
+        value = value.tolist()
+    elif isinstance(value, np.generic):
+        value = value.item()
+    if value is None:
+        return None
+
+    if isinstance(dtype, pl.List):
+        return list(value) if isinstance(value, (list, tuple)) else None
+    if dtype == pl.Boolean:
+        return value if isinstance(value, bool) else None
+    if dtype == pl.Int64:
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return None
+        return int(value) if math.isfinite(value) else None
+    if dtype == pl.Float64:
+        if isinstance(value, bool):
+            return None
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return None
+    # strings
+    if isinstance(value, (list, tuple, dict)):
+        return json.dumps(value)
+    return str(value)
+
+
+class SummaryColumns:
+    """
+    Columnar accumulator of summary rows.
+    Every declared column keeps its own list of values coerced to the schema
+    type on append, so the DataFrame is built column by column without
+    copying rows. Keys outside the schema become string columns.
+    """
+
+    def __init__(self, rows: Iterable[dict[str, Any]] = ()):
+        self.schema = dict(SUMMARY_SCHEMA)
+        self.columns: dict[str, list] = {name: [] for name in self.schema}
+        self.length = 0
+        self.extend(rows)
+
+    def append(self, row: dict[str, Any]) -> None:
+        for key in row:
+            if key not in self.schema:
+                self.schema[key] = pl.Utf8
+                self.columns[key] = [None] * self.length
+        for name, dtype in self.schema.items():
+            self.columns[name].append(_coerce(row.get(name), dtype))
+        self.length += 1
+
+    def extend(self, rows: Iterable[dict[str, Any]]) -> None:
+        for row in rows:
+            self.append(row)
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __iter__(self):
+        """Rows as dicts, without the columns that are empty in a row"""
+        for i in range(self.length):
+            yield {
+                name: values[i]
+                for name, values in self.columns.items()
+                if values[i] is not None
+            }
+
+    def to_frame(self, fmt: str = "parquet") -> pl.DataFrame:
+        """Typed DataFrame; for CSV the list columns are stored as JSON text"""
+        schema = dict(self.schema)
+        columns = dict(self.columns)
+        if fmt == "csv":
+            for name, dtype in self.schema.items():
+                if isinstance(dtype, pl.List):
+                    schema[name] = pl.Utf8
+                    columns[name] = [
+                        None if v is None else json.dumps(v) for v in columns[name]
+                    ]
+        return pl.DataFrame(columns, schema=schema)
+
+
+def summary_frame(rows: Iterable[dict[str, Any]], fmt: str = "csv") -> pl.DataFrame:
+    """Build a typed summary DataFrame from parser dicts or SummaryColumns"""
+    if not isinstance(rows, SummaryColumns):
+        rows = SummaryColumns(rows)
+    return rows.to_frame(fmt)
+
+
+def write_summary(df: pl.DataFrame, path: Path, fmt: str = "csv") -> None:
+    if fmt == "parquet":
+        df.write_parquet(path)
+    elif fmt == "ipc":
+        df.write_ipc(path)
+    else:
+        df.write_csv(path)
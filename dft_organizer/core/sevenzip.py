@@ -1,36 +1,345 @@
+import os
+import shutil
+import subprocess
+import tempfile
 from pathlib import Path
+from typing import Iterable, Optional, Union
+
 import py7zr
 
+from dft_organizer.core.file_policy import FULL, LIGHT, STORE, FilePolicy
+
+
+# py7zr filter chains selectable by name; "max" is the historical setting,
+# zstd and brotli need the optional py7zr codecs (pyzstd / brotli)
+COMPRESSION_PROFILES = {
+    "max": [{"id": py7zr.FILTER_LZMA2, "preset": 9}],
+    "balanced": [{"id": py7zr.FILTER_LZMA2, "preset": 5}],
+    "fast": [{"id": py7zr.FILTER_LZMA2, "preset": 1}],
+    "deflate": [{"id": py7zr.FILTER_DEFLATE}],
+    "zstd": [{"id": py7zr.FILTER_ZSTD, "level": 3}],
+    "brotli": [{"id": py7zr.FILTER_BROTLI, "level": 5}],
+    "store": [{"id": py7zr.FILTER_COPY}],
+}
+DEFAULT_PROFILE = "max"
+# LZMA2 runs at a few MB/s on binary data whatever the preset, so lightly
+# compressed files use Deflate, which stock 7-Zip can still unpack,
+# unless the archive profile is at least as fast
+LIGHT_PROFILE = "deflate"
+FAST_PROFILES = ("deflate", "zstd", "brotli", "store")
+
+
+# 7-Zip command-line switches of the profiles stock 7-Zip can write
+NATIVE_SWITCHES = {
+    "max": ["-m0=LZMA2", "-mx=9"],
+    "balanced": ["-m0=LZMA2", "-mx=5"],
+    "fast": ["-m0=LZMA2", "-mx=1"],
+    "deflate": ["-m0=Deflate"],
+    "store": ["-mx=0"],
+}
+# official Linux build, p7zip full and standalone executables
+NATIVE_EXECUTABLES = ("7zz", "7z", "7za")
+ARCHIVE_BACKENDS = ("auto", "7z", "py7zr")
+
+
+def _class_profiles(profile: str) -> dict[str, str]:
+    """Profile for every FilePolicy class when the archive uses profile"""
+    return {
+        FULL: profile,
+        LIGHT: profile if profile in FAST_PROFILES else LIGHT_PROFILE,
+        STORE: "store",
+    }
+
+
+def _iter_archive_paths(source_dir: Path, exclude: set[Path]):
+    """Directories and files below source_dir, top-down, skipping the excluded directories"""
+    for current, dirnames, filenames in os.walk(source_dir):
+        current_path = Path(current)
+        dirnames[:] = sorted(d for d in dirnames if current_path / d not in exclude)
+        for name in dirnames:
+            yield current_path / name
+        for name in sorted(filenames):
+            yield current_path / name
+
+
+class Py7zrBackend:
+    """
+    Pure Python archiving with py7zr, single-threaded. Writes one filter
+    chain per archive: archives py7zr appends to with other filters can
+    lose files or become unreadable, so file policies need 7-Zip.
+    """
+
+    name = "py7zr"
+    per_file_filters = False
+
+    def supports(self, profile: str) -> bool:
+        return profile in COMPRESSION_PROFILES
+
+    def write(
+        self,
+        source_dir: Path,
+        archive_path: Path,
+        groups: dict[str, list[Path]],
+        exclude: set[Path],
+        class_profiles: dict[str, str],
+    ):
+        """Write all groups with the filters of the full group"""
+        filters = COMPRESSION_PROFILES[class_profiles[FULL]]
+        with py7zr.SevenZipFile(archive_path, 'w', filters=filters) as archive:
+            for paths in groups.values():
+                for path in paths:
+                    archive.write(
+                        path,
+                        arcname=path.relative_to(source_dir.parent)
+                    )
+
+    def names(self, archive_path: Path) -> list[str]:
+        with py7zr.SevenZipFile(archive_path, 'r') as archive:
+            return archive.getnames()
+
+    def extract(self, archive_path: Path, target_dir: Path):
+        with py7zr.SevenZipFile(archive_path, 'r') as archive:
+            archive.extractall(path=target_dir)
+
+
+class Native7zBackend:
+    """
+    The 7-Zip executable run as a subprocess, with multithreaded
+    compression (-mmt). Writes the same 7z layout as Py7zrBackend, so
+    either backend unpacks the other's archives; zstd and brotli need
+    py7zr.
+    """
+
+    name = "7z"
+    per_file_filters = True
+
+    def __init__(self, executable: str, threads: Optional[int] = None):
+        self.executable = executable
+        self.threads = threads
+
+    def supports(self, profile: str) -> bool:
+        return profile in NATIVE_SWITCHES
+
+    def _run(self, args: list[str], cwd: Optional[Path] = None) -> str:
+        completed = subprocess.run(
+            [self.executable, *args],
+            cwd=cwd,
+            capture_output=True,
+            encoding="utf-8",
+            errors="replace",
+        )
+        # exit code 1 is only a warning for 7-Zip, e.g. a file that could not
+        # be read, but the archive then misses that file, so it fails as well
+        if completed.returncode != 0:
+            message = completed.stderr.strip() or completed.stdout.strip()
+            raise RuntimeError(f"{self.executable} exited with {completed.returncode}: {message}")
+        return completed.stdout
+
+    def _add(
+        self,
+        archive_path: Path,
+        cwd: Path,
+        profile: str,
+        list_dir: Path,
+        include: list[Path] = (),
+        exclude: list[Path] = (),
+        names: list[str] = (),
+    ):
+        """7z a with include and exclude list files of paths relative to cwd"""
+        args = ["a", "-t7z", "-y", "-scsUTF-8", *NATIVE_SWITCHES[profile]]
+        args.append(f"-mmt={self.threads}" if self.threads else "-mmt=on")
+        args.append(str(archive_path))
+        args.extend(names)
+        for switch, paths, list_name in (("@", include, "include"), ("-x@", exclude, "exclude")):
+            if not paths:
+                continue
+            list_file = list_dir / f"{list_name}.lst"
+            list_file.write_text(
+                "".join(f"{path.relative_to(cwd).as_posix()}\n" for path in paths),
+                encoding="utf-8",
+            )
+            args.append(f"{switch}{list_file}")
+        self._run(args, cwd=cwd)
 
-def compress_with_7z(source_dir: Path, archive_path: Path) -> bool:
-    """Compress directory using py7zr without storing parent paths"""
+    def write(
+        self,
+        source_dir: Path,
+        archive_path: Path,
+        groups: dict[str, list[Path]],
+        exclude: set[Path],
+        class_profiles: dict[str, str],
+    ):
+        """
+        Add source_dir without the excluded directories and the files of the
+        other groups, then append every other group as a new 7z folder
+        """
+        archive_path = Path(archive_path).resolve()
+        archive_path.unlink(missing_ok=True)
+        cwd = source_dir.parent
+        other_files = [
+            path for file_class, paths in groups.items() if file_class != FULL for path in paths
+        ]
+
+        with tempfile.TemporaryDirectory() as list_dir:
+            list_dir = Path(list_dir)
+            self._add(
+                archive_path,
+                cwd,
+                class_profiles[FULL],
+                list_dir,
+                exclude=[p for p in sorted(exclude) if p.is_relative_to(source_dir)] + other_files,
+                names=[source_dir.name],
+            )
+            for file_class, paths in groups.items():
+                if file_class != FULL and paths:
+                    self._add(
+                        archive_path, cwd, class_profiles[file_class], list_dir, include=paths
+                    )
+
+    def names(self, archive_path: Path) -> list[str]:
+        """Entry paths from the technical listing, after the archive's own properties"""
+        listing = self._run(["l", "-slt", "-sccUTF-8", str(archive_path)])
+        entries = listing.split("\n----------\n", 1)[-1]
+        return [line[len("Path = "):] for line in entries.splitlines() if line.startswith("Path = ")]
+
+    def extract(self, archive_path: Path, target_dir: Path):
+        self._run(["x", "-y", f"-o{target_dir}", str(archive_path)])
+
+
+ArchiveBackend = Union[Py7zrBackend, Native7zBackend]
+
+
+def find_7z() -> Optional[str]:
+    """Path of the first 7-Zip executable on PATH"""
+    for name in NATIVE_EXECUTABLES:
+        executable = shutil.which(name)
+        if executable:
+            return executable
+    return None
+
+
+def get_backend(name: str = "auto", threads: Optional[int] = None) -> ArchiveBackend:
+    """
+    Archive backend by name: "7z" for the 7-Zip executable, "py7zr",
+    or "auto" for 7-Zip when it is on PATH and py7zr otherwise.
+    threads limits the 7-Zip compression threads (default: all cores).
+    """
+    if name not in ARCHIVE_BACKENDS:
+        raise ValueError(f"Unknown archive backend: {name}")
+    if name == "py7zr":
+        return Py7zrBackend()
+    executable = find_7z()
+    if executable is not None:
+        return Native7zBackend(executable, threads)
+    if name == "7z":
+        raise RuntimeError(f"No 7-Zip executable found on PATH ({', '.join(NATIVE_EXECUTABLES)})")
+    return Py7zrBackend()
+
+
+def file_policy_supported(backend: str = "auto", profile: str = DEFAULT_PROFILE) -> bool:
+    """Whether write_archive applies file policies with this backend and profile"""
     try:
-        print(f"Archiving {source_dir} to {archive_path}...")
+        archiver = get_backend(backend)
+    except RuntimeError:
+        return False
+    return archiver.per_file_filters and all(
+        archiver.supports(p) for p in _class_profiles(profile).values()
+    )
+
 
-        with py7zr.SevenZipFile(archive_path, 'w', filters=[
-            {"id": py7zr.FILTER_LZMA2, "preset": 9}
-        ]) as archive:
-            for path in source_dir.rglob("*"):
-                archive.write(
-                    path,
-                    arcname=path.relative_to(source_dir.parent)
-                )
+def write_archive(
+    source_dir: Path,
+    archive_path: Path,
+    exclude: Iterable[Path] = (),
+    profile: str = DEFAULT_PROFILE,
+    file_policy: Optional[FilePolicy] = None,
+    backend: str = "auto",
+    threads: Optional[int] = None,
+) -> int:
+    """
+    Write source_dir into archive_path without storing parent paths,
+    compressed with a COMPRESSION_PROFILES entry by the named backend
+    (see get_backend); profiles 7-Zip cannot write fall back to py7zr.
+    Directories in exclude are left out with everything below them.
+    With file_policy and the 7-Zip backend, files it classifies as light or
+    store are appended as separate 7z folders with LIGHT_PROFILE or no
+    compression; py7zr ignores the policy (see Py7zrBackend).
+    Returns the number of input bytes.
+    """
+    if profile not in COMPRESSION_PROFILES:
+        raise ValueError(f"Unknown compression profile: {profile}")
+    source_dir = Path(source_dir)
+    exclude = {Path(p) for p in exclude}
 
+    class_profiles = _class_profiles(profile)
+    archiver = get_backend(backend, threads)
+    if not all(archiver.supports(p) for p in class_profiles.values()):
+        archiver = Py7zrBackend()
+    if not archiver.per_file_filters:
+        file_policy = None
+
+    groups = {FULL: [], LIGHT: [], STORE: []}
+    input_bytes = 0
+    for path in _iter_archive_paths(source_dir, exclude):
+        if not path.is_file():
+            groups[FULL].append(path)
+            continue
+        input_bytes += path.stat().st_size
+        groups[FULL if file_policy is None else file_policy.classify(path)].append(path)
+
+    archiver.write(source_dir, archive_path, groups, exclude, class_profiles)
+    return input_bytes
+
+
+def compress_with_7z(
+    source_dir: Path,
+    archive_path: Path,
+    exclude: Iterable[Path] = (),
+    profile: str = DEFAULT_PROFILE,
+    file_policy: Optional[FilePolicy] = None,
+    backend: str = "auto",
+    threads: Optional[int] = None,
+) -> bool:
+    """Compress directory without storing parent paths"""
+    try:
+        print(f"Archiving {source_dir} to {archive_path} ({profile})...")
+        write_archive(source_dir, archive_path, exclude, profile, file_policy, backend, threads)
         return True
     except Exception as e:
         print(f"Error archiving {source_dir}: {e}")
         return False
 
 
-def extract_7z(archive_path: Path, target_dir: Path) -> bool:
+def archive_roots(archive_path: Path, backend: str = "auto") -> list[str]:
+    """
+    Top-level entries of an archive, read from its header by the named
+    backend; in auto mode archives 7-Zip cannot list are read with py7zr
+    """
+    archiver = get_backend(backend)
+    try:
+        names = archiver.names(archive_path)
+    except RuntimeError:
+        if backend != "auto" or isinstance(archiver, Py7zrBackend):
+            raise
+        names = Py7zrBackend().names(archive_path)
+    return sorted({name.split("/")[0] for name in names})
+
+
+def extract_7z(archive_path: Path, target_dir: Path, backend: str = "auto") -> bool:
     """Unpack 7z archive to target dir"""
     try:
         print(f"Extracting {archive_path}...")
-
-        with py7zr.SevenZipFile(archive_path, 'r') as archive:
-            archive.extractall(path=target_dir)
+        archiver = get_backend(backend)
+        try:
+            archiver.extract(archive_path, target_dir)
+        except RuntimeError as e:
+            if backend != "auto" or isinstance(archiver, Py7zrBackend):
+                raise
+            # e.g. zstd or brotli archives, which stock 7-Zip cannot read
+            print(f"{archiver.executable} failed ({e}), retrying with py7zr")
+            Py7zrBackend().extract(archive_path, target_dir)
 
         return True
     except Exception as e:
         print(f"Error extracting {archive_path}: {e}")
-        return False
\ No newline at end of file
+        return False
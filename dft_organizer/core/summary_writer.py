@@ -0,0 +1,74 @@
+from pathlib import Path
+from typing import Any, Optional
+
+import polars as pl
+
+from dft_organizer.core.schema import summary_frame
+
+
+class SummaryWriter:
+    """
+    Write summary rows as they are produced instead of keeping them in memory.
+    Every batch is flushed to its own Arrow IPC part file next to the target,
+    so an interrupted run keeps everything written so far.
+    close() merges the parts into the summary file (csv, parquet or ipc)
+    and removes them.
+    """
+
+    def __init__(self, path: Path, fmt: str = "csv", batch_size: int = 1000):
+        self.path = Path(path)
+        self.fmt = fmt
+        self.parts_dir = self.path.with_suffix(".parts")
+        self.parts_dir.mkdir(parents=True, exist_ok=True)
+        self.batch_size = batch_size
+        self.rows_written = 0
+        self.parts: list[Path] = []
+        self.closed = False
+
+    def frame(self, rows: list[dict[str, Any]]) -> pl.DataFrame:
+        return summary_frame(rows, self.fmt)
+
+    def write_rows(self, rows: list[dict[str, Any]]) -> None:
+        if not rows:
+            return
+        df = self.frame(rows)
+        part = self.parts_dir / f"part-{len(self.parts):05d}.arrow"
+        df.write_ipc(part)
+        self.parts.append(part)
+        self.rows_written += len(rows)
+
+    def close(self) -> Optional[Path]:
+        """Merge the parts into the summary file, return its path if written"""
+        if self.closed:
+            return self.path if self.path.exists() else None
+        self.closed = True
+
+        if not self.parts:
+            self.parts_dir.rmdir()
+            return None
+
+        try:
+            frames = [pl.scan_ipc(part) for part in self.parts]
+            merged = pl.concat(frames, how="diagonal_relaxed")
+            if self.fmt == "parquet":
+                merged.sink_parquet(self.path)
+            elif self.fmt == "ipc":
+                merged.sink_ipc(self.path)
+            else:
+                merged.sink_csv(self.path)
+        except Exception as e:
+            print(f"Cannot merge summary parts, rows are kept in {self.parts_dir}: {e}")
+            return None
+
+        for part in self.parts:
+            part.unlink()
+        self.parts_dir.rmdir()
+        return self.path
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # on errors the parts stay on disk with the partial results
+        if exc_type is None:
+            self.close()
@@ -0,0 +1,82 @@
+from pathlib import Path
+from typing import Any, Optional
+
+import numpy as np
+import polars as pl
+
+from dft_organizer.core.summary_writer import SummaryWriter
+from dft_organizer.crystal_parser.scf import crystal_scf_trajectory
+from dft_organizer.fleur_parser.scf import fleur_scf_trajectory
+
+
+TRAJECTORY_ARRAYS = ("cycle", "energy", "delta", "fermi")
+
+SCF_TRAJECTORY_SCHEMA = {
+    "output_path": pl.Utf8,
+    "engine": pl.Utf8,
+    "cycle": pl.List(pl.Int64),
+    "energy": pl.List(pl.Float64),
+    "delta": pl.List(pl.Float64),
+    "fermi": pl.List(pl.Float64),
+}
+
+SCF_EXTRACTORS = {
+    "crystal": crystal_scf_trajectory,
+    "fleur": fleur_scf_trajectory,
+}
+
+
+def scf_trajectory(output_path: Path, engine: str) -> Optional[dict[str, np.ndarray]]:
+    """Per-iteration SCF arrays of a calculation output, None if unreadable"""
+    extractor = SCF_EXTRACTORS.get(engine)
+    if extractor is None:
+        return None
+    try:
+        return extractor(output_path)
+    except Exception as e:
+        print(f"Cannot read SCF iterations of {output_path}: {e}")
+        return None
+
+
+def scf_columns(trajectory: Optional[dict[str, np.ndarray]]) -> dict[str, Any]:
+    """
+    Summary columns of a trajectory:
+    - scf_iterations: iterations of the last SCF (cycle numbers restart
+      for every SCF of a CRYSTAL optimization);
+    - scf_final_delta: |delta| of the last iteration, energy change (Ha)
+      for CRYSTAL, charge density distance (me/bohr^3) for FLEUR.
+    """
+    if trajectory is None or not len(trajectory["cycle"]):
+        return {"scf_iterations": None, "scf_final_delta": float("nan")}
+    cycles = trajectory["cycle"]
+    restarts = np.flatnonzero(np.diff(cycles) <= 0)
+    last_start = restarts[-1] + 1 if len(restarts) else 0
+    return {
+        "scf_iterations": int(len(cycles) - last_start),
+        "scf_final_delta": float(abs(trajectory["delta"][-1])),
+    }
+
+
+def scf_trajectory_frame(rows: list[dict[str, Any]]) -> pl.DataFrame:
+    columns = {
+        name: [
+            row[name].tolist() if isinstance(row[name], np.ndarray) else row[name]
+            for row in rows
+        ]
+        for name in SCF_TRAJECTORY_SCHEMA
+    }
+    return pl.DataFrame(columns, schema=SCF_TRAJECTORY_SCHEMA)
+
+
+class ScfTrajectoryWriter(SummaryWriter):
+    """
+    SummaryWriter for the SCF trajectory sidecar: one row per calculation
+    with the output path, the engine and the per-iteration arrays as list
+    columns, always written as Parquet.
+    """
+
+    def __init__(self, path: Path, batch_size: int = 1000):
+        super().__init__(path, "parquet", batch_size)
+
+    def frame(self, rows: list[dict[str, Any]]) -> pl.DataFrame:
+        return scf_trajectory_frame(rows)
@@ -0,0 +1,82 @@
+import sqlite3
+from pathlib import Path
+from typing import Optional
+
+
+# AiiDA repositories shard node directories as root/xx/yy/rest
+UUID_DEPTH = 3
+
+
+def normalize_uuid(uuid: str) -> str:
+    """UUID without dashes, lowercase, so dashed and plain spellings match"""
+    return uuid.replace("-", "").lower()
+
+
+def dashed_uuid(uuid: str) -> str:
+    """Canonical 8-4-4-4-12 form of a 32-digit UUID, as AiiDA stores it"""
+    uuid = normalize_uuid(uuid)
+    return f"{uuid[:8]}-{uuid[8:12]}-{uuid[12:16]}-{uuid[16:20]}-{uuid[20:]}"
+
+
+def uuid_candidates(uuid: str) -> list[str]:
+    """Shard directories (xx/yy/rest, relative to the root) a UUID may live in"""
+    uuid = normalize_uuid(uuid)
+    candidates = [f"{uuid[:2]}/{uuid[2:4]}/{uuid[4:]}"]
+    if len(uuid) == 32:
+        # AiiDA keeps the dashes of the canonical form in rest
+        candidates.append(f"{uuid[:2]}/{uuid[2:4]}/{dashed_uuid(uuid)[4:]}")
+    return candidates
+
+
+def uuid_index_path(root_path: Path) -> Path:
+    """Location of the UUID index stored next to the scanned root"""
+    root_path = Path(root_path).resolve()
+    return root_path.parent / f".{root_path.name}.uuid_index.sqlite"
+
+
+class UuidIndex:
+    """
+    SQLite map of AiiDA UUIDs to calculation directories relative to the root.
+    Filled during scans and by the fallback search of find_calculation_by_uuid.
+    UUIDs are stored normalized (see normalize_uuid).
+    """
+
+    def __init__(self, root_path: Path, path: Optional[Path] = None):
+        self.root_path = Path(root_path).resolve()
+        self.path = Path(path) if path is not None else uuid_index_path(self.root_path)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS uuids (uuid TEXT PRIMARY KEY, directory TEXT NOT NULL)"
+        )
+
+    def add(self, uuid: str, directory: Path) -> None:
+        if not uuid:
+            return
+        self.conn.execute(
+            "INSERT OR REPLACE INTO uuids (uuid, directory) VALUES (?, ?)",
+            (normalize_uuid(uuid), Path(directory).relative_to(self.root_path).as_posix()),
+        )
+
+    def lookup(self, uuid: str) -> Optional[Path]:
+        """Indexed directory of the UUID, None if unknown or gone from disk"""
+        uuid = normalize_uuid(uuid)
+        row = self.conn.execute(
+            "SELECT directory FROM uuids WHERE uuid = ?", (uuid,)
+        ).fetchone()
+        if row is None:
+            return None
+        directory = self.root_path / row[0]
+        if not directory.is_dir():
+            self.conn.execute("DELETE FROM uuids WHERE uuid = ?", (uuid,))
+            return None
+        return directory
+
+    def close(self) -> None:
+        self.conn.commit()
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
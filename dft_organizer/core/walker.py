@@ -0,0 +1,68 @@
+import os
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Iterator, Optional, Sequence
+
+
+# files marking a directory as a calculation
+CALCULATION_MARKERS = ("OUTPUT", "out", "out.xml")
+
+
+def _is_ignored(name: str, rel_path: str, ignore: Sequence[str]) -> bool:
+    return any(fnmatch(name, pattern) or fnmatch(rel_path, pattern) for pattern in ignore)
+
+
+def walk_calculation_dirs(
+    root_path: Path,
+    max_depth: Optional[int] = None,
+    ignore: Sequence[str] = (),
+    prune_calculations: bool = False,
+) -> Iterator[tuple[Path, list[str]]]:
+    """
+    Yield (directory, filenames) for every directory below root_path,
+    as soon as the directory is listed.
+    Built on os.scandir, so file/directory checks use the entry type from
+    the listing instead of an extra stat call per entry.
+
+    - max_depth: Do not go deeper than this many levels below root_path.
+    - ignore: Glob patterns matched against directory names and paths
+      relative to root_path; matching directories are skipped entirely.
+    - prune_calculations: Do not descend into a directory that already
+      contains a calculation output (see CALCULATION_MARKERS).
+    """
+    root_path = Path(root_path)
+    stack = [(root_path, 0)]
+
+    while stack:
+        current_dir, depth = stack.pop()
+        filenames = []
+        subdirs = []
+        try:
+            with os.scandir(current_dir) as it:
+                for entry in it:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if not is_dir:
+                        filenames.append(entry.name)
+                    elif not entry.is_symlink():
+                        subdirs.append(entry.name)
+        except OSError:
+            # unreadable directories are skipped like in os.walk
+            continue
+
+        if depth > 0:
+            yield current_dir, filenames
+
+        if max_depth is not None and depth >= max_depth:
+            continue
+        if prune_calculations and depth > 0:
+            if any(name in filenames for name in CALCULATION_MARKERS):
+                continue
+
+        for name in reversed(sorted(subdirs)):
+            path = current_dir / name
+            if ignore and _is_ignored(name, path.relative_to(root_path).as_posix(), ignore):
+                continue
+            stack.append((path, depth + 1))
@@ -0,0 +1,239 @@
+import re
+from pathlib import Path
+from typing import Union
+
+from pycrystal import CRYSTOUT
+
+from dft_organizer.mmap_scan import find_all, mapped_file
+
+
+# pycrystal marks the start of a CRYSTAL or PROPERTIES log with this line
+CODE_MARKER = "*                              MAIN AUTHORS"
+
+PROPERTIES_MARKERS = (
+    " RESTART WITH NEW K POINTS NET",
+    " CRYSTAL - PROPERTIES",
+    "Wavefunction file can not be found",
+)
+
+# outputs the summary path does not handle, left to the full parser
+UNSUPPORTED_MARKERS = (
+    " MOLECULAR CALCULATION",
+    " OPTIMIZE THE STRUCTURE AND RE-RUN",
+) + PROPERTIES_MARKERS
+
+# lines read by CRYSTOUT.get_timings and CRYSTOUT.decide_method,
+# plus the optimization points counted by the summary
+SUMMARY_MARKERS = (
+    "EEEEEEEEEE STARTING",
+    "EEEEEEEEEE TERMINATION",
+    " HARTREE-FOCK HAMILTONIAN",
+    " (EXCHANGE)[CORRELATION] FUNCTIONAL:",
+    " THE CORRELATION FUNCTIONAL ",
+    " THE EXCHANGE FUNCTIONAL ",
+    " HYBRID EXCHANGE ",
+    " TYPE OF CALCULATION :  UNRESTRICTED OPEN SHELL",
+    " SHRINK. FACT.(MONKH.) ",
+    "COUPLED-PERTURBED KOHN-SHAM CALCULATION (CPKS)",
+    " F F F F F F F F F F F F F F F F F F F F F F F F F F F F F F F F F F F F F F F",
+    "COULOMB OVERLAP TOL         (T1)",
+    "COULOMB PENETRATION TOL     (T2)",
+    "EXCHANGE OVERLAP TOL        (T3)",
+    "EXCHANGE PSEUDO OVP (F(G))  (T4)",
+    "EXCHANGE PSEUDO OVP (P(G))  (T5)",
+    " WEIGHT OF F(I) IN F(I+1)",
+    " ANDERSON MIX: BETA= ",
+    " % OF FOCK/KS MATRICES MIXING WHEN BROYDEN METHOD IS ON",
+    " WO PARAMETER(D.D. Johnson, PRB38, 12807,(1988)",
+    " NUMBER OF SCF ITERATIONS AFTER WHICH BROYDEN METHOD IS ACTIVE",
+    " EIGENVALUE LEVEL SHIFTING OF ",
+    " FERMI SMEARING - TEMPERATURE SMEARING OF FERMI SURFACE ",
+    "OPTIMIZATION - POINT",
+)
+
+# the CRYSTOUT.patterns used by the summary, as bytes patterns for the mapped file
+STRUCTURE_RE = re.compile(
+    rb"\n\sPRIMITIVE CELL(.+?)ATOM BELONGING TO THE ASYMMETRIC UNIT", re.DOTALL
+)
+CART_VECTORS_RE = re.compile(
+    rb"DIRECT LATTICE VECTORS CARTESIAN COMPONENTS \(ANGSTROM\)(.+?)\n\n", re.DOTALL
+)
+# CRYSTOUT.patterns["conduction_states"] is (INSULATING|CONDUCTING) STATE(.*?)TTTTTTT
+CONDUCTION_STATES = (b"INSULATING STATE", b"CONDUCTING STATE")
+CONDUCTION_END = b"TTTTTTT"
+ENDING_RE = re.compile(rb"EEEEEEEEEE TERMINATION(.+?)\n")
+# CRYSTOUT.patterns["t4"]; optgeom data exist only if these lines are printed
+RMS_DISPLAC_RE = re.compile(rb"\n\sRMS\sDISPLAC.(.+?)\n")
+
+
+class FastPathError(Exception):
+    """The summary scan cannot reproduce CRYSTOUT for this file"""
+
+
+def _normalized(buf):
+    """
+    The mapped file itself, or for outputs that CRYSTOUT would normalize
+    (CR line breaks, "FORTRAN STOP" inclusions) a normalized copy.
+    """
+    if buf.find(b"\r") == -1 and buf.find(b"FORTRAN STOP\n") == -1:
+        return buf
+    return buf[:].replace(b"\r\n", b"\n").replace(b"\r", b"\n").replace(b"FORTRAN STOP\n", b"")
+
+
+def _line_end(buf, pos: int, hi: int) -> int:
+    end = buf.find(b"\n", pos, hi)
+    return hi if end == -1 else end
+
+
+def _marker_lines(buf, lo: int, hi: int) -> list[bytes]:
+    """Whole lines holding SUMMARY_MARKERS between lo and hi, in file order"""
+    found = sorted(
+        (pos, marker)
+        for marker in (m.encode() for m in SUMMARY_MARKERS)
+        for pos in find_all(buf, marker, lo, hi)
+    )
+    lines = []
+    last_end = lo - 1
+    for pos, marker in found:
+        if pos <= last_end:
+            continue
+        start = max(buf.rfind(b"\n", lo, pos) + 1, lo)
+        end = _line_end(buf, pos + len(marker), hi)
+        # k-points are split() from the text following the marker
+        if marker == b" SHRINK. FACT.(MONKH.) " and end < hi:
+            end = _line_end(buf, end + 1, hi)
+        lines.append(buf[start:end])
+        last_end = end
+    return lines
+
+
+def _conduction_blocks(buf, lo: int, hi: int) -> list[bytes]:
+    """Non-overlapping matches of the CRYSTOUT conduction_states pattern"""
+    starts = sorted(pos for state in CONDUCTION_STATES for pos in find_all(buf, state, lo, hi))
+    blocks = []
+    last_end = lo
+    for pos in starts:
+        if pos < last_end:
+            continue
+        end = buf.find(CONDUCTION_END, pos + len(CONDUCTION_STATES[0]), hi)
+        if end == -1:
+            break
+        last_end = end + len(CONDUCTION_END)
+        blocks.append(buf[pos:last_end])
+    return blocks
+
+
+def _scan_buffer(buf) -> dict:
+    marker = CODE_MARKER.encode()
+    lo = buf.find(marker)
+    if lo == -1:
+        raise FastPathError("No CRYSTAL log found")
+    second = buf.find(marker, lo + 1)
+    hi = len(buf) if second == -1 else second
+
+    # same decisions as CRYSTOUT.__init__ on the log parts
+    if second == -1:
+        if any(buf.find(m.encode(), lo, hi) != -1 for m in PROPERTIES_MARKERS):
+            raise FastPathError("PROPERTIES output")
+    elif len(buf) - second > 2000 and not any(
+        buf.find(m.encode(), second) != -1 for m in PROPERTIES_MARKERS
+    ):
+        raise FastPathError("Several merged outputs")
+
+    for unsupported in UNSUPPORTED_MARKERS:
+        if buf.find(unsupported.encode(), lo, hi) != -1:
+            raise FastPathError(f"Unsupported output: {unsupported.strip()}")
+
+    pieces = _marker_lines(buf, lo, hi)
+
+    first = last = None
+    for match in STRUCTURE_RE.finditer(buf, lo, hi):
+        if first is None:
+            first = match.group()
+        else:
+            last = match.group()
+    pieces.extend(p for p in (first, last) if p is not None)
+
+    cart = None
+    for match in CART_VECTORS_RE.finditer(buf, lo, hi):
+        cart = match.group()
+    if cart is not None:
+        pieces.append(cart)
+
+    pieces.extend(_conduction_blocks(buf, lo, hi))
+
+    pdata = None
+    if second != -1:
+        ending = ENDING_RE.search(buf, second)
+        pdata = ending.group().decode() if ending is not None else ""
+
+    return {
+        "header": buf[:lo].decode(),
+        "data": "\n" + b"\n".join(pieces).decode() + "\n",
+        "pdata": pdata,
+        "optgeom": RMS_DISPLAC_RE.search(buf, lo, hi) is not None,
+    }
+
+
+def scan_crystal_output(path: Union[str, Path]) -> dict:
+    """
+    Collect what the summary needs from OUTPUT without loading it:
+    the input header, the lines with SUMMARY_MARKERS, the first and last
+    structure blocks, the last cartesian lattice vectors and the conduction
+    blocks. The file is memory-mapped and searched with the CRYSTOUT
+    patterns, only the matched pieces are copied.
+    """
+    with mapped_file(path) as buf:
+        return _scan_buffer(_normalized(buf))
+
+
+class SummaryCRYSTOUT(CRYSTOUT):
+    """
+    CRYSTOUT restricted to the summary fields: timings, input, first and last
+    structure, method (H, tol, k, smear, spin, techs) and conduction states.
+    The pycrystal extraction methods run on the reduced text collected by
+    scan_crystal_output, so the values match the full parser.
+    info["optgeom"] only tells whether optimization criteria were printed.
+    Raises FastPathError or CRYSTOUT_Error if the full parser is needed.
+    """
+
+    def __init__(self, filename: Union[str, Path]):
+        scan = scan_crystal_output(filename)
+
+        self.data = scan["data"]
+        self.pdata = scan["pdata"]
+        self.properties_calc = scan["pdata"] is not None
+        self.crystal_calc = True
+        self.molecular_case = False
+        self.info = {
+            "warns": [],
+            "program": None,
+            "techs": [],
+            "duration": None,
+            "timestamp": None,
+            "input": None,
+            "structures": [],
+            "H": None,
+            "H_types": [],
+            "tol": None,
+            "k": None,
+            "smear": None,
+            "spin": False,
+            "lockstate": None,
+            "conduction": [],
+            "optgeom": [],
+            "ncycles": [],
+        }
+
+        self.info["duration"], self.info["timestamp"] = self.get_timings()
+        self.comment, self.info["input"], self.info["program"] = self.get_input_and_meta(
+            scan["header"]
+        )
+        self.info["structures"] = self.get_structures()
+        self.decide_method()
+        self.info["conduction"] = self.get_conduction()
+
+        # CRYSTOUT.decide_scfdata skips ONELOG runs
+        onelog = self.info["input"] is not None and "ONELOG" in self.info["input"]
+        if scan["optgeom"] and not onelog:
+            self.info["optgeom"] = [[None] * 5]
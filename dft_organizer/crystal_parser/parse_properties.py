@@ -1,32 +1,20 @@
-from pathlib import Path
+from dft_organizer.crystal_parser.properties.transport import load_transport_table
+
 
 def parse_seebeck_first_line(filepath: str) -> tuple[float, dict, float]:
     """
     Parse seebeck output file and extract the first valid data line.
+    The table is loaded with load_transport_table, in one vectorized pass.
     Returns:
         - average S (float)
         - S components dictionary: {"S_xx": .., "S_yy": .., "S_zz": ..}
         - temperature T (float)
     """
-    filepath = Path(filepath)
-    if not filepath.exists():
-        raise FileNotFoundError(f"Seebeck file not found: {filepath}")
-
-    with open(filepath, 'r') as f:
-        for line in f:
-            parts = line.split()
-            if len(parts) >= 12:
-                try:
-                    T = float(parts[1])
-                    S_xx = float(parts[3])
-                    S_yy = float(parts[7])
-                    S_zz = float(parts[11])
-                    avg_s = (S_xx + S_yy + S_zz) / 3
-                    return avg_s, {"S_xx": S_xx, "S_yy": S_yy, "S_zz": S_zz}, T
-                except ValueError:
-                    continue
-
-    raise ValueError("No valid Seebeck line found in file")
+    table = load_transport_table(filepath)
+    S = table.first_tensor
+    S_xx, S_yy, S_zz = (float(v) for v in S.diagonal())
+    avg_s = (S_xx + S_yy + S_zz) / 3
+    return avg_s, {"S_xx": S_xx, "S_yy": S_yy, "S_zz": S_zz}, table.first_temperature
 
 
 if __name__ == "__main__":
@@ -0,0 +1,320 @@
+import hashlib
+import os
+import re
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+
+from dft_organizer.mmap_scan import mapped_file
+
+
+HARTREE_TO_EV = 27.2114
+# tolerance (eV) on the E_F position for the band edges
+FERMI_TOL = 0.1
+
+# arrays cached per file: bands (nspin, nk, nbands) and dos (nspin, npts, 1 + nproj),
+# float32, energies in eV relative to E_F, DOS in states/eV (positive for both spins)
+ELECTRONIC_FILES = {
+    "BAND.DAT": ("bands",),
+    "DOSS.DAT": ("dos",),
+    "fort.25": ("bands", "dos"),
+}
+# files searched for each array, in order of preference
+ARRAY_SOURCES = {
+    "bands": ("BAND.DAT", "fort.25"),
+    "dos": ("DOSS.DAT", "fort.25"),
+}
+ELECTRONIC_COLUMNS = ("bands_gap", "vbm", "cbm", "dos_at_fermi")
+# .npy array cache, next to the parse cache and outside the calculation trees;
+# least recently used arrays are removed beyond ARRAY_CACHE_MAX_BYTES
+DEFAULT_ARRAY_CACHE = Path("~/.cache/dft_organizer/arrays").expanduser()
+ARRAY_CACHE_MAX_BYTES = 1024**3
+
+# fort.25 blocks: "-%-" + flag + BAND|DOSS, 2 I5 and 3 E12.5 on the header line,
+# 2 E12.5 on the second, 6 I5 on the third, then the E12.5 values
+F25_BLOCK_RE = re.compile(rb"-%-.(BAND|DOSS)")
+F25_FLOAT_WIDTH = 12
+F25_FLOAT_RE = re.compile(rb"[-+]?\d*\.\d+(?:[EeDd][-+]?\d+)?")
+
+DAT_NSPIN_RE = re.compile(rb"NSPIN:\s*(\d+)")
+DAT_EFERMI_RE = re.compile(rb"EFERMI\s*\(([A-Za-z]+)\)\s*:?\s*([-+]?\d*\.\d+(?:[Ee][-+]?\d+)?)")
+
+
+def _fixed_floats(data: bytes) -> np.ndarray:
+    """E12.5 values written without separators, converted in one numpy call"""
+    packed = data.replace(b"\r", b"").replace(b"\n", b"")
+    if len(packed) % F25_FLOAT_WIDTH == 0:
+        try:
+            return np.frombuffer(packed, dtype=f"S{F25_FLOAT_WIDTH}").astype(np.float64)
+        except ValueError:
+            pass
+    return np.array(F25_FLOAT_RE.findall(data), dtype=np.float64)
+
+
+def _f25_blocks(buf) -> list[tuple[bytes, bytes, bytes, bytes, bytes]]:
+    """(kind, header, second line, third line, data) of every fort.25 block"""
+    starts = [m.start() for m in F25_BLOCK_RE.finditer(buf)] + [len(buf)]
+    blocks = []
+    for start, end in zip(starts, starts[1:]):
+        head, second, third, data = (bytes(buf[start:end]).split(b"\n", 3) + [b""] * 3)[:4]
+        blocks.append((head[4:8], head, second, third, data))
+    return blocks
+
+
+def read_fort25(path: Union[str, Path]) -> dict:
+    """
+    Bands and DOS of a CRYSTAL fort.25 file, as in ELECTRONIC_FILES.
+    Spin-down band segments repeat the k-path of the spin-up ones,
+    DOS projections restart their numbering for spin down.
+    The total DOS is the last projection.
+    """
+    with mapped_file(path) as buf:
+        blocks = _f25_blocks(buf)
+
+    segments = [[], []]
+    seen_paths = set()
+    dos = [[], []]
+    e_fermi = dos_grid = None
+    spin = last_proj = 0
+
+    for kind, head, second, third, data in blocks:
+        nrow, npts = int(head[8:13]), int(head[13:18])
+        _, step, fermi = _fixed_floats(head[18:54])
+        if kind == b"BAND":
+            e_fermi = fermi
+            values = _fixed_floats(data)[: nrow * npts]
+            band_spin = 1 if third in seen_paths else 0
+            seen_paths.add(third)
+            segments[band_spin].append(values.reshape(npts, nrow))
+        else:
+            proj = int(third[:5])
+            if proj <= last_proj:
+                spin += 1
+            last_proj = proj
+            if dos_grid is None:
+                e0 = _fixed_floats(second)[1]
+                dos_grid = (e0 + step * np.arange(npts) - fermi) * HARTREE_TO_EV
+            # spin-down DOS is written negative
+            dos[min(spin, 1)].append(np.abs(_fixed_floats(data)[:npts]) / HARTREE_TO_EV)
+
+    bands = None
+    if segments[0]:
+        channels = [np.vstack(s) for s in segments if s]
+        if len(channels) == 2 and channels[0].shape != channels[1].shape:
+            channels = channels[:1]
+        bands = ((np.stack(channels) - e_fermi) * HARTREE_TO_EV).astype(np.float32)
+
+    dos_array = None
+    if dos[0]:
+        channels = [np.column_stack([dos_grid] + d) for d in dos if d]
+        if len(channels) == 2 and channels[0].shape != channels[1].shape:
+            channels = channels[:1]
+        dos_array = np.stack(channels).astype(np.float32)
+
+    return {"bands": bands, "dos": dos_array}
+
+
+def _read_dat(path: Union[str, Path]) -> tuple[np.ndarray, float, int]:
+    """Numeric rows, E_F in Hartree and the number of spins of a BAND.DAT/DOSS.DAT"""
+    with open(path, "rb") as f:
+        raw = f.read()
+    header = b"\n".join(line for line in raw.splitlines() if line.lstrip().startswith(b"#"))
+    nspin_match = DAT_NSPIN_RE.search(header)
+    nspin = int(nspin_match.group(1)) if nspin_match else 1
+    fermi_match = DAT_EFERMI_RE.search(header)
+    fermi = float(fermi_match.group(2)) if fermi_match else 0.0
+    if fermi_match and fermi_match.group(1).upper() == b"EV":
+        fermi /= HARTREE_TO_EV
+
+    rows = np.loadtxt(
+        [line for line in raw.splitlines() if line.strip()[:1] not in (b"#", b"@", b"&", b"")],
+        ndmin=2,
+    )
+    return rows, fermi, nspin
+
+
+def _spin_channels(rows: np.ndarray, nspin: int) -> np.ndarray:
+    """Spin channels written one after the other -> (nspin, rows, columns)"""
+    if nspin == 2 and len(rows) % 2 == 0:
+        return rows.reshape(2, len(rows) // 2, rows.shape[1])
+    return rows[np.newaxis]
+
+
+def read_band_dat(path: Union[str, Path]) -> dict:
+    """Bands of BAND.DAT: k coordinate then band energies in Hartree per line"""
+    rows, fermi, nspin = _read_dat(path)
+    bands = (_spin_channels(rows, nspin)[:, :, 1:] - fermi) * HARTREE_TO_EV
+    return {"bands": bands.astype(np.float32)}
+
+
+def read_doss_dat(path: Union[str, Path]) -> dict:
+    """DOS of DOSS.DAT: energy then projections, total last, in Hartree units per line"""
+    rows, fermi, nspin = _read_dat(path)
+    dos = _spin_channels(rows, nspin).copy()
+    dos[:, :, 0] = (dos[:, :, 0] - fermi) * HARTREE_TO_EV
+    dos[:, :, 1:] = np.abs(dos[:, :, 1:]) / HARTREE_TO_EV
+    return {"dos": dos.astype(np.float32)}
+
+
+READERS = {
+    "BAND.DAT": read_band_dat,
+    "DOSS.DAT": read_doss_dat,
+    "fort.25": read_fort25,
+}
+
+
+def sidecar_path(path: Union[str, Path], kind: str, cache_dir: Path = DEFAULT_ARRAY_CACHE) -> Path:
+    """
+    Cache file of an array of path, keyed by its absolute path, size and
+    mtime, so a changed or replaced file gets a new entry
+    """
+    path = Path(path).resolve()
+    stat = path.stat()
+    key = hashlib.sha1(f"{path}\0{stat.st_size}\0{stat.st_mtime_ns}".encode()).hexdigest()
+    return Path(cache_dir) / f"{key}.{path.name}.{kind}.npy"
+
+
+def _save_sidecar(sidecar: Path, array: Optional[np.ndarray]) -> None:
+    """Atomic np.save, an empty array records that the file has no such data"""
+    if array is None:
+        array = np.empty((0, 0, 0), dtype=np.float32)
+    tmp = sidecar.with_name(f".{sidecar.name}.{os.getpid()}.tmp")
+    try:
+        sidecar.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp, "wb") as f:
+            np.save(f, array)
+        os.replace(tmp, sidecar)
+    except OSError:
+        tmp.unlink(missing_ok=True)
+
+
+def prune_array_cache(cache_dir: Path, max_bytes: int = ARRAY_CACHE_MAX_BYTES) -> int:
+    """
+    Remove the least recently used .npy files once cache_dir exceeds
+    max_bytes, down to 90% of it; arrays are touched on every use.
+    Entries of changed or deleted files are never used again and go first.
+    Returns the number of removed files.
+    """
+    entries = []
+    try:
+        with os.scandir(cache_dir) as it:
+            for entry in it:
+                if entry.name.endswith(".npy") and entry.is_file():
+                    st = entry.stat()
+                    entries.append((st.st_mtime_ns, st.st_size, entry.path))
+    except OSError:
+        return 0
+    total = sum(size for _, size, _ in entries)
+    if total <= max_bytes:
+        return 0
+
+    removed = 0
+    for _, size, entry_path in sorted(entries):
+        if total <= int(0.9 * max_bytes):
+            break
+        try:
+            os.unlink(entry_path)
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+    return removed
+
+
+def load_electronic_arrays(
+    path: Union[str, Path], cache_dir: Optional[Path] = None
+) -> dict:
+    """
+    Arrays of BAND.DAT, DOSS.DAT or fort.25 by kind, None if absent.
+    With cache_dir (e.g. DEFAULT_ARRAY_CACHE) parsed arrays are saved
+    there as .npy files and memory-mapped instead of re-parsing while the
+    file is unchanged; the calculation directory is never written to.
+    The cache is bounded by ARRAY_CACHE_MAX_BYTES (see prune_array_cache).
+    """
+    path = Path(path)
+    kinds = ELECTRONIC_FILES[path.name]
+    sidecars = {}
+    if cache_dir is not None:
+        sidecars = {kind: sidecar_path(path, kind, cache_dir) for kind in kinds}
+
+    if sidecars and all(s.exists() for s in sidecars.values()):
+        try:
+            arrays = {kind: np.load(s, mmap_mode="r") for kind, s in sidecars.items()}
+            for sidecar in sidecars.values():
+                os.utime(sidecar)
+            return {kind: a if a.size else None for kind, a in arrays.items()}
+        except (OSError, ValueError):
+            pass
+
+    arrays = READERS[path.name](path)
+    for kind, sidecar in sidecars.items():
+        _save_sidecar(sidecar, arrays.get(kind))
+    if sidecars:
+        prune_array_cache(Path(cache_dir))
+    return {kind: arrays.get(kind) for kind in kinds}
+
+
+def band_edges(bands: np.ndarray, tol: float = FERMI_TOL) -> dict:
+    """
+    VBM, CBM (eV relative to E_F) and band gap over all spins and k-points.
+    CRYSTAL puts E_F at the highest level of the SCF k-mesh, which a band
+    path may slightly exceed, so bands starting below E_F + tol are valence
+    and only a band extending beyond tol on both sides of E_F makes the gap 0.
+    """
+    bands = np.asarray(bands, dtype=np.float64)
+    # (nspin, nbands)
+    lowest = bands.min(axis=1)
+    highest = bands.max(axis=1)
+    valence = lowest <= tol
+    if not valence.any() or valence.all():
+        return {"bands_gap": float("nan"), "vbm": float("nan"), "cbm": float("nan")}
+    vbm = float(highest[valence].max())
+    cbm = float(lowest[~valence].min())
+    metallic = ((lowest < -tol) & (highest > tol)).any()
+    gap = 0.0 if metallic else max(cbm - vbm, 0.0)
+    return {"bands_gap": gap, "vbm": vbm, "cbm": cbm}
+
+
+def dos_at_fermi(dos: np.ndarray) -> float:
+    """Total DOS at E_F (states/eV), summed over spins"""
+    dos = np.asarray(dos, dtype=np.float64)
+    return float(sum(np.interp(0.0, channel[:, 0], channel[:, -1]) for channel in dos))
+
+
+def electronic_columns(directory: Union[str, Path], cache_dir: Optional[Path] = None) -> dict:
+    """
+    Summary columns from the band structure and DOS files in directory,
+    taken from the first of ARRAY_SOURCES present for each array.
+    No columns without such files, nan for unreadable ones.
+    """
+    directory = Path(directory)
+    loaded = {}
+    results = {}
+    for kind, names in ARRAY_SOURCES.items():
+        found = False
+        array = None
+        for name in names:
+            path = directory / name
+            if not path.exists():
+                continue
+            found = True
+            if name not in loaded:
+                try:
+                    loaded[name] = load_electronic_arrays(path, cache_dir)
+                except Exception:
+                    loaded[name] = {}
+            array = loaded[name].get(kind)
+            if array is not None:
+                break
+        if not found:
+            continue
+        if kind == "bands":
+            results.update(
+                band_edges(array)
+                if array is not None
+                else dict.fromkeys(("bands_gap", "vbm", "cbm"), float("nan"))
+            )
+        else:
+            results["dos_at_fermi"] = dos_at_fermi(array) if array is not None else float("nan")
+    return results
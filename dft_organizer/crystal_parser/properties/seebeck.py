@@ -1,3 +1,11 @@
+import numpy as np
+
+from dft_organizer.crystal_parser.properties.transport import (
+    TENSOR_COMPONENTS,
+    load_transport_table,
+)
+
+
 def parse_seebeck_line(line):
     """
     Parse a line of Seebeck data.
@@ -29,19 +37,17 @@ def get_avg_seebeck_from_file(file_path: str, temperature: float):
     """
     Reads the file and finds the first line with the given temperature.
     Returns the average of S_xx, S_yy, S_zz and the S components dictionary.
+    The table is loaded once and the temperature bisected, see TransportTable.
     """
-    with open(file_path, "r") as f:
-        for line in f:
-            line = line.strip()
-            if not line or line.startswith("#"):
-                continue
-            parsed = parse_seebeck_line(line)
-            if parsed:
-                Mu, T, N, S = parsed
-                if abs(T - temperature) < 1e-3: 
-                    avg_s = (S["S_xx"] + S["S_yy"] + S["S_zz"]) / 3
-                    return avg_s, S
-    return None, None
+    table = load_transport_table(file_path)
+    block = table.temperature_rows(temperature)
+    if block is None:
+        return None, None
+    # first line of that temperature in file order
+    first = block.start + int(np.argmin(table.order[block]))
+    S = {f"S_{c}": float(v) for c, v in zip(TENSOR_COMPONENTS, table.tensor[first].ravel())}
+    avg_s = (S["S_xx"] + S["S_yy"] + S["S_zz"]) / 3
+    return avg_s, S
 
 if __name__ == "__main__":
     file_path = "/data/aiida/20/d3/0336-e004-4f5d-a0c0-0df2c2a24f4c/SEEBECK.DAT"
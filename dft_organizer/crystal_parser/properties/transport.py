@@ -0,0 +1,163 @@
+import warnings
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+
+
+# component order of the 9-column tensors in SEEBECK.DAT and friends
+TENSOR_COMPONENTS = ("xx", "xy", "xz", "yx", "yy", "yz", "zx", "zy", "zz")
+# component order of the 6-column symmetric tensors (e.g. SIGMA.DAT)
+SYMMETRIC_COMPONENTS = ("xx", "xy", "xz", "yy", "yz", "zz")
+_SYMMETRIC_INDEX = (0, 1, 2, 1, 3, 4, 2, 4, 5)
+
+# temperatures (K) reported as summary columns, see transport_columns
+SUMMARY_TEMPERATURES = (300.0,)
+# summary columns per transport file: (file name, column prefix, scale to column units)
+SUMMARY_TABLES = (
+    ("SEEBECK.DAT", "seebeck", 1e6),  # V/K -> uV/K
+    ("SIGMA.DAT", "sigma", 1.0),  # 1/(Ohm m)
+)
+TEMPERATURE_TOL = 1e-3
+
+
+class TransportTable:
+    """
+    Mu x T x 3x3 tensor table written by CRYSTAL BOLTZTRA
+    (SEEBECK.DAT, SIGMA.DAT, SIGMAS.DAT, KAPPA.DAT, ...).
+    Rows are sorted by temperature then Mu, the rows of temperatures[i]
+    are offsets[i]:offsets[i + 1], so a temperature is found by bisection.
+    """
+
+    def __init__(self, rows: np.ndarray):
+        rows = np.asarray(rows, dtype=float)
+        if rows.ndim != 2 or rows.shape[0] == 0:
+            raise ValueError("No transport data rows")
+        ncomp = rows.shape[1] - 3
+        if ncomp == len(TENSOR_COMPONENTS):
+            tensor = rows[:, 3:12]
+        elif ncomp == len(SYMMETRIC_COMPONENTS):
+            tensor = rows[:, 3:9][:, _SYMMETRIC_INDEX]
+        else:
+            raise ValueError(f"Unexpected number of tensor components: {ncomp}")
+        tensor = tensor.reshape(-1, 3, 3)
+
+        # the file order is kept for the first data line
+        self.first_temperature = float(rows[0, 1])
+        self.first_tensor = tensor[0]
+
+        order = np.lexsort((rows[:, 0], rows[:, 1]))
+        # line index in the file of each sorted row
+        self.order = order
+        self.mu = rows[order, 0]
+        self.T = rows[order, 1]
+        self.carriers = rows[order, 2]
+        self.tensor = tensor[order]
+
+        self.temperatures, starts = np.unique(self.T, return_index=True)
+        self.offsets = np.append(starts, len(self.T))
+
+    def __len__(self) -> int:
+        return len(self.T)
+
+    def temperature_index(self, temperature: float, tol: float = TEMPERATURE_TOL) -> Optional[int]:
+        """Index into temperatures of the value within tol, None if absent"""
+        i = int(np.searchsorted(self.temperatures, temperature))
+        candidates = [j for j in (i - 1, i) if 0 <= j < len(self.temperatures)]
+        if not candidates:
+            return None
+        j = min(candidates, key=lambda k: abs(self.temperatures[k] - temperature))
+        return j if abs(self.temperatures[j] - temperature) < tol else None
+
+    def temperature_rows(self, temperature: float, tol: float = TEMPERATURE_TOL) -> Optional[slice]:
+        """Slice of the sorted rows at the temperature, None if absent"""
+        j = self.temperature_index(temperature, tol)
+        if j is None:
+            return None
+        return slice(int(self.offsets[j]), int(self.offsets[j + 1]))
+
+    def at_temperature(self, temperature: float, tol: float = TEMPERATURE_TOL) -> Optional[tuple]:
+        """(mu, carriers, tensor) arrays of one temperature, None if absent"""
+        rows = self.temperature_rows(temperature, tol)
+        if rows is None:
+            return None
+        return self.mu[rows], self.carriers[rows], self.tensor[rows]
+
+    def tensor_at(self, temperature: float, mu: float = 0.0) -> Optional[np.ndarray]:
+        """3x3 tensor at the temperature and the Mu grid point closest to mu"""
+        block = self.at_temperature(temperature)
+        if block is None:
+            return None
+        mus, _, tensors = block
+        return tensors[int(np.argmin(np.abs(mus - mu)))]
+
+    def average_at(self, temperature: float, mu: float = 0.0) -> float:
+        """(xx + yy + zz) / 3 at the temperature and mu, nan if absent"""
+        tensor = self.tensor_at(temperature, mu)
+        return float(np.trace(tensor)) / 3 if tensor is not None else float("nan")
+
+    def window_average(self, t_min: float, t_max: float, mu: float = 0.0) -> float:
+        """Mean of average_at over the temperatures in [t_min, t_max], nan if none"""
+        lo, hi = np.searchsorted(self.temperatures, (t_min, t_max + TEMPERATURE_TOL))
+        values = [self.average_at(t, mu) for t in self.temperatures[lo:hi]]
+        return float(np.mean(values)) if values else float("nan")
+
+
+def load_transport_table(path: Union[str, Path]) -> TransportTable:
+    """
+    Read a BOLTZTRA table in one vectorized pass: Mu, T, N and the tensor
+    components of every line into arrays, "#" lines are comments.
+    Lines with another number of columns are skipped, as by the line parsers.
+    """
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"Transport file not found: {path}")
+    try:
+        rows = np.loadtxt(path, comments="#", ndmin=2)
+    except ValueError:
+        # ragged or broken lines, the slower parser drops them
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            rows = np.genfromtxt(path, comments="#", invalid_raise=False, ndmin=2)
+        rows = rows[~np.isnan(rows).any(axis=1)] if rows.size else rows
+    return TransportTable(rows)
+
+
+def transport_column_names(temperatures=SUMMARY_TEMPERATURES) -> list[str]:
+    return [
+        f"{prefix}_{temperature:g}K"
+        for _, prefix, _ in SUMMARY_TABLES
+        for temperature in temperatures
+    ]
+
+
+def load_transport_tables(directory: Union[str, Path]) -> dict:
+    """Tables of SUMMARY_TABLES present in directory by file name, None if unreadable"""
+    tables = {}
+    for name, _, _ in SUMMARY_TABLES:
+        path = Path(directory) / name
+        if not path.exists():
+            continue
+        try:
+            tables[name] = load_transport_table(path)
+        except Exception:
+            tables[name] = None
+    return tables
+
+
+def transport_columns(tables: dict, temperatures=SUMMARY_TEMPERATURES, mu: float = 0.0) -> dict:
+    """
+    Summary columns <prefix>_<T>K from the tables of load_transport_tables:
+    the tensor average at the Mu point closest to mu for each temperature,
+    looked up in the loaded arrays. Missing files give no columns,
+    unreadable ones or absent temperatures nan.
+    """
+    results = {}
+    for name, prefix, scale in SUMMARY_TABLES:
+        if name not in tables:
+            continue
+        table = tables[name]
+        for temperature in temperatures:
+            value = table.average_at(temperature, mu) * scale if table is not None else float("nan")
+            results[f"{prefix}_{temperature:g}K"] = value
+    return results
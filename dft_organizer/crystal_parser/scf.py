@@ -0,0 +1,52 @@
+import re
+from pathlib import Path
+from typing import Union
+
+import numpy as np
+
+from dft_organizer.mmap_scan import mapped_file
+
+
+# one SCF cycle ends with its CYC line; the Fermi level of the cycle
+# (or the top of the valence bands) is printed before it
+SCF_EVENTS_RE = re.compile(
+    rb"CYC\s+(\d+)\s+ETOT\(AU\)\s+(\S+)\s+DETOT\s+(\S+)"
+    rb"|EFERMI\(AU\)\s+(\S+)"
+    rb"|TOP OF VALENCE BANDS[^\n]*?EIG\s+(\S+)\s+AU"
+)
+
+
+def _float(value: bytes) -> float:
+    try:
+        return float(value.replace(b"D", b"E"))
+    except ValueError:
+        return float("nan")
+
+
+def crystal_scf_trajectory(path: Union[str, Path]) -> dict[str, np.ndarray]:
+    """
+    SCF cycles of a CRYSTAL OUTPUT in file order, from one pass over the
+    mapped file: cycle number, total energy (Ha), energy change DETOT (Ha)
+    and Fermi level or top of the valence bands (Ha, nan if not printed).
+    Cycle numbers restart at 0 for every SCF of an optimization.
+    """
+    cycles, energies, deltas, fermis = [], [], [], []
+    fermi = float("nan")
+
+    with mapped_file(path) as buf:
+        for cycle, energy, delta, efermi, top in SCF_EVENTS_RE.findall(buf):
+            if cycle:
+                cycles.append(int(cycle))
+                energies.append(_float(energy))
+                deltas.append(_float(delta))
+                fermis.append(fermi)
+                fermi = float("nan")
+            else:
+                fermi = _float(efermi or top)
+
+    return {
+        "cycle": np.array(cycles, dtype=np.int64),
+        "energy": np.array(energies, dtype=np.float64),
+        "delta": np.array(deltas, dtype=np.float64),
+        "fermi": np.array(fermis, dtype=np.float64),
+    }
@@ -7,29 +7,68 @@ from pycrystal import CRYSTOUT, CRYSTOUT_Error
 from ase.geometry import cell_to_cellpar
 
 from dft_organizer.ase_utils import get_formula
-from dft_organizer.crystal_parser.parse_properties import parse_seebeck_first_line
+from dft_organizer.crystal_parser.fast_output import SummaryCRYSTOUT
+from dft_organizer.mmap_scan import findall_in_file
+from dft_organizer.crystal_parser.properties.electronic import (
+    ELECTRONIC_COLUMNS,
+    ELECTRONIC_FILES,
+    electronic_columns,
+)
+from dft_organizer.crystal_parser.properties.transport import (
+    SUMMARY_TABLES,
+    load_transport_tables,
+    transport_column_names,
+    transport_columns,
+)
 
 
-def count_optimization_cycles(filename):
+# bump when parse_crystal_output results change, invalidates cached results
+PARSER_VERSION = "3"
+# files next to OUTPUT that parse_crystal_output also reads
+RELATED_FILES = tuple(name for name, _, _ in SUMMARY_TABLES) + tuple(ELECTRONIC_FILES)
+
+
+OPT_POINT_RE = re.compile(r"OPTIMIZATION - POINT\s+(\d+)")
+OPT_POINT_BYTES_RE = re.compile(OPT_POINT_RE.pattern.encode())
+
+INPUT_PARAMS = ("MAXCYCLE", "TOLDEE", "TOLLDENS", "TOLLGRID", "SHRINK", "TOLINTEG")
+# lookahead, so that a keyword on the value line of another one is still found
+INPUT_PARAMS_RE = re.compile(rf"(?=({'|'.join(INPUT_PARAMS)})\n([^\n]+))")
+
+
+def optimization_points(text: str) -> list[str]:
+    """Numbers N of all "OPTIMIZATION - POINT N" lines in the text"""
+    return OPT_POINT_RE.findall(text)
+
+
+def parse_input_params(text: str) -> dict:
+    """First value line after each of INPUT_PARAMS, in one pass over the input block"""
+    params = {}
+    for match in INPUT_PARAMS_RE.finditer(text):
+        params.setdefault(match.group(1), match.group(2))
+        if len(params) == len(INPUT_PARAMS):
+            break
+    return {p: params[p] for p in INPUT_PARAMS if p in params}
+
+
+def count_optimization_cycles(filename, verbose: bool = False):
     """
     Count the number of geometry optimization cycles in CRYSTAL output files.
     Looks for lines containing "OPTIMIZATION - POINT N".
+    The file is memory-mapped and searched as bytes, it is not loaded.
     """
-    with open(filename, 'r') as f:
-        content = f.read()
-
-    # Pattern matches "COORDINATE AND CELL OPTIMIZATION - POINT N" where N is a number
-    pattern = r'OPTIMIZATION - POINT\s+(\d+)'
-    matches = re.findall(pattern, content)
-
-    if matches:
-        num_cycles = len(matches)
-        print(f"Number of geometry optimization cycles: {num_cycles}")
-        print(f"Found points: {', '.join(matches)}")
-        return num_cycles
-    else:
-        print("No optimization cycles found")
-        return 0
+    matches = [m.decode() for m in findall_in_file(filename, OPT_POINT_BYTES_RE)]
+    return _report_optimization_cycles(matches, verbose)
+
+
+def _report_optimization_cycles(matches: list[str], verbose: bool = False) -> int:
+    if verbose:
+        if matches:
+            print(f"Number of geometry optimization cycles: {len(matches)}")
+            print(f"Found points: {', '.join(matches)}")
+        else:
+            print("No optimization cycles found")
+    return len(matches)
 
 
 def round_floats(obj, ndigits: int = 2):
@@ -77,9 +116,30 @@ def _structure_displacement(structures: list) -> dict:
         "rmsd_disp": float(np.sqrt(np.mean(sq))),
     }
 
-def parse_crystal_output(path: Path) -> dict:
+def _read_output(path: Path, fast: bool = False, verbose: bool = False):
+    """
+    Full CRYSTOUT, or with fast=True the summary-only SummaryCRYSTOUT,
+    falling back to CRYSTOUT when the fast path cannot handle the file.
+    """
+    if fast:
+        try:
+            return SummaryCRYSTOUT(str(path))
+        except Exception as e:
+            if verbose:
+                print(f"Fast path failed for {path}, using full parser: {e}")
+    return CRYSTOUT(str(path))
+
+
+def parse_crystal_output(path: Path, verbose: bool = False, fast: bool = False) -> dict:
+    """
+    Summary of a CRYSTAL OUTPUT file.
+    The file is read once by pycrystal; optimization points and input
+    parameters are taken from the text it already holds in memory.
+    With fast=True only the summary fields are extracted (see fast_output).
+    Per-file details are printed only with verbose=True.
+    """
     try:
-        co = CRYSTOUT(str(path))
+        co = _read_output(path, fast, verbose)
         content: dict = co.info
     except CRYSTOUT_Error:
         print(f"CRYSTAL OUTPUT file: {path} is not readable!")
@@ -92,7 +152,6 @@ def parse_crystal_output(path: Path) -> dict:
                 "chemical_formula": "",
                 "techs_1_FMIXING": "",
                 "techs_2": "",
-                "tolinteg"
                 "t1": "",
                 "t5": "",
                 "k": float("nan"),
@@ -102,7 +161,9 @@ def parse_crystal_output(path: Path) -> dict:
                 "optgeom": float("nan"),
                 "num_opt_cycles": float("nan"),
                 "seebeck_avg": float("nan"),
-                "temperature": float("nan")
+                "temperature": float("nan"),
+                **{name: float("nan") for name in transport_column_names()},
+                **dict.fromkeys(ELECTRONIC_COLUMNS, float("nan")),
             },
             2,
         )
@@ -120,7 +181,12 @@ def parse_crystal_output(path: Path) -> dict:
     if "optgeom" in co.info.keys():
         if co.info["optgeom"] != []:
             results["optgeom"] = True
-        num_opt_cycles = count_optimization_cycles(str(path))
+        # pycrystal keeps the OUTPUT text, fall back to a streaming read otherwise
+        text = getattr(co, "data", None)
+        if isinstance(text, str):
+            num_opt_cycles = _report_optimization_cycles(optimization_points(text), verbose)
+        else:
+            num_opt_cycles = count_optimization_cycles(str(path), verbose)
         results["num_opt_cycles"] = num_opt_cycles
     else:
         results["optgeom"] = False
@@ -135,11 +201,7 @@ def parse_crystal_output(path: Path) -> dict:
         results["techs_2"] = ""
 
     # input parms
-    input_params = ["MAXCYCLE", "TOLDEE", "TOLLDENS", "TOLLGRID", "SHRINK", "TOLINTEG"]
-    for p in input_params:
-        match = re.search(rf'{p}\n([^\n]+)', content['input'])
-        if match:
-            results[p] = match.group(1)
+    results.update(parse_input_params(content['input']))
 
     try:
         # results["techs_3_smear"] = content.get("techs", ["", "", "", ""])[3]
@@ -158,16 +220,20 @@ def parse_crystal_output(path: Path) -> dict:
     except Exception:
         results["duration"] = float("nan")
 
-    # seebeck
-    seebeck_file = path.parent / "SEEBECK.DAT"
-    if seebeck_file.exists():
-        try:
-            avg_s, S_components, temperature = parse_seebeck_first_line(str(seebeck_file))
-            results["seebeck_avg"] = avg_s
-            results["temperature"] = temperature
-        except Exception:
+    # transport tables: SEEBECK.DAT, SIGMA.DAT, each read once
+    tables = load_transport_tables(path.parent)
+    if "SEEBECK.DAT" in tables:
+        seebeck = tables["SEEBECK.DAT"]
+        if seebeck is not None:
+            results["seebeck_avg"] = float(np.trace(seebeck.first_tensor)) / 3
+            results["temperature"] = seebeck.first_temperature
+        else:
             results["seebeck_avg"] = float("nan")
             results["temperature"] = float("nan")
+    results.update(transport_columns(tables))
+
+    # band structure and DOS files (BAND.DAT, DOSS.DAT, fort.25)
+    results.update(electronic_columns(path.parent))
 
     # band gap
     bandgap = float("nan")
@@ -208,6 +274,11 @@ def parse_crystal_output(path: Path) -> dict:
     return round_floats(results, 2)
 
 
+def parse_crystal_output_fast(path: Path, verbose: bool = False) -> dict:
+    """parse_crystal_output with the summary-only fast path"""
+    return parse_crystal_output(path, verbose=verbose, fast=True)
+
+
 if __name__ == "__main__":
     res = parse_crystal_output(
         Path("/data/aiida_crystal_base/0a/2f/a4e3-fb3e-4419-b02f-b1a50c762872/OUTPUT")
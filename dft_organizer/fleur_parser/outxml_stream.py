@@ -0,0 +1,36 @@
+from pathlib import Path
+from typing import Union
+from xml.etree import ElementTree as ET
+
+
+ITERATION_TAG = "iteration"
+
+
+def last_iteration_xml(path: Union[str, Path]) -> bytes:
+    """
+    FLEUR out.xml reduced to the header and the final <iteration>.
+    The file is read with iterparse and every iteration is dropped from
+    the tree as soon as the next one is complete, so at most two
+    iterations are held in memory whatever the length of the run.
+    Everything outside the iterations (program, input, structure,
+    timings) is kept. Raises ET.ParseError for truncated files.
+    """
+    root = None
+    stack = []
+    kept = None
+
+    for event, elem in ET.iterparse(str(path), events=("start", "end")):
+        if event == "start":
+            if root is None:
+                root = elem
+            stack.append(elem)
+            continue
+
+        stack.pop()
+        if elem.tag == ITERATION_TAG and stack:
+            if kept is not None:
+                kept_parent, kept_elem = kept
+                kept_parent.remove(kept_elem)
+            kept = (stack[-1], elem)
+
+    return ET.tostring(root, encoding="utf-8", xml_declaration=True)
@@ -0,0 +1,97 @@
+import re
+from pathlib import Path
+from typing import Union
+from xml.etree import ElementTree as ET
+
+import numpy as np
+
+from dft_organizer.fleur_parser.outxml_stream import ITERATION_TAG
+from dft_organizer.mmap_scan import mapped_file
+
+
+# the text output closes an iteration with the (overall) charge density distance,
+# the per-spin distances are skipped
+OUT_SCF_EVENTS_RE = re.compile(
+    rb"total energy=\s*(\S+)"
+    rb"|[Ff]ermi[- ][Ee]nergy[^\n=:]*[=:]\s*(-?\d+\.\d*(?:[EeDd][-+]?\d+)?)"
+    rb"|distance of charge densities for (spin\s+\d+\s+)?it=\s*(\d+):\s*(\S+)"
+)
+
+
+def _float(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+def _trajectory(cycles, energies, deltas, fermis) -> dict[str, np.ndarray]:
+    return {
+        "cycle": np.array(cycles, dtype=np.int64),
+        "energy": np.array(energies, dtype=np.float64),
+        "delta": np.array(deltas, dtype=np.float64),
+        "fermi": np.array(fermis, dtype=np.float64),
+    }
+
+
+def _outxml_trajectory(path: Path) -> dict[str, np.ndarray]:
+    """
+    Iterations of out.xml, streamed with iterparse: every iteration is
+    removed from its parent once read, and every other top-level element
+    (header, input, timings) once it ends, so memory stays bounded by one
+    iteration or one top-level element whatever the length of the run
+    """
+    cycles, energies, deltas, fermis = [], [], [], []
+    stack = []
+    for event, elem in ET.iterparse(str(path), events=("start", "end")):
+        if event == "start":
+            stack.append(elem)
+            continue
+
+        stack.pop()
+        if elem.tag == ITERATION_TAG:
+            energy = elem.find("totalEnergy")
+            fermi = elem.find("FermiEnergy")
+            distance = elem.find("densityConvergence/overallChargeDensity")
+            if distance is None:
+                distance = elem.find("densityConvergence/chargeDensity")
+            cycles.append(int(_float(elem.get("overallNumber", len(cycles) + 1))))
+            energies.append(_float(energy.get("value")) if energy is not None else float("nan"))
+            deltas.append(_float(distance.get("distance")) if distance is not None else float("nan"))
+            fermis.append(_float(fermi.get("value")) if fermi is not None else float("nan"))
+            if stack:
+                stack[-1].remove(elem)
+        elif len(stack) == 1:
+            stack[0].remove(elem)
+    return _trajectory(cycles, energies, deltas, fermis)
+
+
+def _out_trajectory(path: Path) -> dict[str, np.ndarray]:
+    """Iterations of the text output, from one pass over the mapped file"""
+    cycles, energies, deltas, fermis = [], [], [], []
+    energy = fermi = float("nan")
+    with mapped_file(path) as buf:
+        for total, efermi, spin, it, distance in OUT_SCF_EVENTS_RE.findall(buf):
+            if total:
+                energy = _float(total)
+            elif efermi:
+                fermi = _float(efermi.replace(b"D", b"E"))
+            elif not spin:
+                cycles.append(int(it))
+                energies.append(energy)
+                deltas.append(_float(distance))
+                fermis.append(fermi)
+                energy = fermi = float("nan")
+    return _trajectory(cycles, energies, deltas, fermis)
+
+
+def fleur_scf_trajectory(path: Union[str, Path]) -> dict[str, np.ndarray]:
+    """
+    SCF iterations of a FLEUR out.xml or out file, streamed: iteration
+    number, total energy (Ha), charge density distance (me/bohr^3) and
+    Fermi energy (Ha), nan where an iteration does not print a value.
+    """
+    path = Path(path)
+    if path.suffix == ".xml":
+        return _outxml_trajectory(path)
+    return _out_trajectory(path)
@@ -1,13 +1,30 @@
+import io
 import re
 import math
 from pathlib import Path
 
 import numpy as np
+from masci_tools.io.fleur_xml import load_inpxml, load_outxml
 from masci_tools.io.parsers.fleur import outxml_parser
-from ase.io import read
+from masci_tools.util.xml.xml_getters import get_structure_data
+from ase import Atoms
 from ase.geometry import cell_to_cellpar
 
-from dft_organizer.ase_utils import get_formula 
+from dft_organizer.ase_utils import displacement_metrics, get_formula
+from dft_organizer.fleur_parser.outxml_stream import last_iteration_xml
+from dft_organizer.tail_reader import search_tail
+
+
+# bump when parse_fleur_output results change, invalidates cached results
+PARSER_VERSION = "4"
+# files next to the output that parse_fleur_output also reads
+RELATED_FILES = ("inp.xml", "relax.xml")
+
+# end-of-run quantities of the text output, searched from the end of the file
+OUT_TAIL_PATTERNS = {
+    "duration": re.compile(rb"Total execution time:\s*(\d+)sec"),
+    "bandgap": re.compile(rb"bandgap\s*:\s*([\d\.E+-]+)\s*htr", re.IGNORECASE),
+}
 
 
 def round_floats(obj, ndigits: int = 2):
@@ -45,12 +62,65 @@ def _nan_cellpar_results() -> dict:
     }
 
 
-def parse_fleur_out_xml(filename: Path) -> dict:
+def _atoms_from_tree(xmltree, schema_dict, include_relaxations: bool = True) -> Atoms:
+    """Structure of a loaded inp.xml/out.xml, as ase.io.read(format="fleur-outxml") builds it"""
+    atoms, cell, pbc = get_structure_data(
+        xmltree, schema_dict, include_relaxations=include_relaxations
+    )
+    return Atoms(
+        symbols=[site.symbol for site in atoms],
+        positions=[site.position for site in atoms],
+        cell=cell,
+        pbc=pbc,
+    )
+
+
+def _load_outxml(filename: Path, last_iteration_only: bool = True):
+    """
+    masci_tools tree of out.xml; with last_iteration_only the header and the
+    final iteration from a streaming pass, so memory does not grow with the
+    number of iterations. Truncated files fall back to the full recovering load.
+    """
+    if last_iteration_only:
+        try:
+            return load_outxml(io.BytesIO(last_iteration_xml(filename)))
+        except Exception:
+            pass
+    return load_outxml(filename)
+
+
+def local_displacement(directory: Path, final: Atoms) -> dict:
     """
-    Parse FLEUR out.xml file using masci_tools and return results dictionary
+    Displacement between the inp.xml positions and the relaxed ones,
+    without the AiiDA database. The final structure is inp.xml with the
+    relax.xml displacements if present, else the given out.xml structure.
+    nan without inp.xml or with a different number of atoms.
     """
+    nan = {"sum_sq_disp": float("nan"), "rmsd_disp": float("nan")}
+    inp_path = directory / "inp.xml"
+    if not inp_path.is_file():
+        return nan
     try:
-        parsed_data = outxml_parser(filename)
+        inp_tree, inp_schema = load_inpxml(inp_path)
+        initial = _atoms_from_tree(inp_tree, inp_schema, include_relaxations=False)
+        if (directory / "relax.xml").is_file():
+            final = _atoms_from_tree(inp_tree, inp_schema, include_relaxations=True)
+        return displacement_metrics(initial, final)
+    except Exception as e:
+        print(f"Cannot compute displacement in {directory}: {e}")
+        return nan
+
+
+def parse_fleur_out_xml(filename: Path, last_iteration_only: bool = True) -> dict:
+    """
+    Parse FLEUR out.xml file using masci_tools and return results dictionary.
+    The XML is parsed once, the output values and the structure are
+    both taken from the same tree. Only final values are reported, so by
+    default only the final iteration is kept (see last_iteration_xml).
+    """
+    try:
+        xmltree, schema_dict = _load_outxml(filename, last_iteration_only)
+        parsed_data = outxml_parser(xmltree)
     except Exception as e:
         results = {"duration": float("nan"), 
                 "bandgap": float("nan"),                 
@@ -75,8 +145,8 @@ def parse_fleur_out_xml(filename: Path) -> dict:
 
     # structure -> cellpar columns
     try:
-        ase_obj = read(filename, format="fleur-outxml")
-        a, b, c, alpha, beta, gamma = cell_to_cellpar(ase_obj.get_cell())  
+        ase_obj = _atoms_from_tree(xmltree, schema_dict)
+        a, b, c, alpha, beta, gamma = cell_to_cellpar(ase_obj.get_cell())
         results.update(
             {
                 "a": float(a),
@@ -96,28 +166,23 @@ def parse_fleur_out_xml(filename: Path) -> dict:
         results["chemical_formula"] = ""
         return round_floats(results, 2)
 
-    # displacement metrics
-    inp_path = filename.parent / "inp.xml"
-    if inp_path.is_file():
-        disp = {"sum_sq_disp": 0.0, "rmsd_disp": 0.0}
-        results.update(disp)
-    else:
-        results["sum_sq_disp"] = float("nan")
-        results["rmsd_disp"] = float("nan")
+    # displacement metrics from the local inp.xml / relax.xml
+    results.update(local_displacement(filename.parent, ase_obj))
 
     return round_floats(results, 2)
 
 
 def parse_fleur_output(filename: Path) -> dict:
     """
-    Parse FLEUR output file and return results dictionary
+    Parse FLEUR output file and return results dictionary.
+    The text output is read from the end until the execution time
+    and the band gap are found.
     """
     if filename.suffix == ".xml":
         return parse_fleur_out_xml(filename)
 
     try:
-        with open(filename, "r", encoding="utf-8", errors="ignore") as f:
-            content = f.read()
+        found = search_tail(filename, OUT_TAIL_PATTERNS)
     except Exception as e:
         print(f"Error reading file {filename}: {e}")
         return {}
@@ -125,17 +190,12 @@ def parse_fleur_output(filename: Path) -> dict:
     results = {}
     results.update(_nan_cellpar_results())
 
-    time_match = re.search(r"Total execution time:\s*(\d+)sec", content)
-    results["duration"] = float(time_match.group(1)) / 3600 if time_match else float("nan")
+    time_match = found["duration"]
+    results["duration"] = float(time_match[0]) / 3600 if time_match else float("nan")
 
-    bandgap_match = re.search(r"bandgap\s*:\s*([\d\.E+-]+)\s*htr", content, re.IGNORECASE)
-    if not bandgap_match:
-        bandgap_match = re.search(
-            r"FERHIS:\s*Fermi-Energy by histogram:\s*bandgap\s*:\s*([\d\.E+-]+)\s*htr",
-            content,
-            re.IGNORECASE,
-        )
-    results["bandgap"] = float(bandgap_match.group(1)) * 27.2114 if bandgap_match else float("nan")
+    # the last printed band gap is the one of the final iteration
+    bandgap_match = found["bandgap"]
+    results["bandgap"] = float(bandgap_match[0]) * 27.2114 if bandgap_match else float("nan")
 
     results["sum_sq_disp"] = float("nan")
     results["rmsd_disp"] = float("nan")
@@ -1,72 +1,98 @@
-import xml.etree.ElementTree as ET
 from pathlib import Path
-from typing import Union
+from typing import Iterable, Union
+from xml.parsers import expat
 
 
-def detect_calculation_code(filepath: Union[str, Path]) -> tuple[str, str]:
+HEADER_SIZE = 6000
+XML_CHUNK_SIZE = 64 * 1024
+
+FLEUR_XML_ROOTS = ("fleurOutput", "fleurInput")
+
+# FLEUR signatures
+FLEUR_SIGNATURES = [
+    "This output is generated by fleur",
+    "This is FLEUR version",
+    "fleur 37",
+    "fleur 36",
+    "fleur 35",
+    "FERHIS Fermi-Energy",
+    "FERHIS: Fermi-Energy",
+    "total energy=",
+    "l-like charge",
+    "density convergence",
+    "subroutine atom2",
+    "atom2 entered",
+]
+
+# CRYSTAL signatures
+CRYSTAL_SIGNATURES = [
+    "CRYSTAL17",
+    "CRYSTAL14",
+    "CRYSTAL23",
+    "EEEE    CCCC  RRRR",
+    "UNIVERSITY OF TORINO",
+    "TOTAL ENERGY(DFT)",
+    "SCF ENDED",
+    "DIRECT LATTICE VECTORS",
+    "PRIMITIVE CELL",
+    "SHRINK FACTORS",
+]
+
+
+class _XmlSniffDone(Exception):
+    pass
+
+
+def _sniff_xml(chunks: Iterable[bytes]) -> tuple[str, str]:
     """
-    Define the DFT code used for the calculation based on file content.
+    Feed XML chunks to an expat parser and stop at the FLEUR root start tag
+    or at the first <iteration> element. No tree is built, so memory does
+    not depend on the document size.
     """
-    filepath = Path(filepath)
+    found = {}
+
+    def start_element(name, attrs):
+        if "root" not in found:
+            found["root"] = name
+            if name in FLEUR_XML_ROOTS:
+                raise _XmlSniffDone
+        if name == "iteration":
+            found["iteration"] = True
+            raise _XmlSniffDone
 
+    parser = expat.ParserCreate()
+    parser.StartElementHandler = start_element
     try:
-        with open(filepath, "rb") as f:
-            header = f.read(6000) 
-    except Exception as e:
-        return "unknown", f"Error: {e}"
+        for chunk in chunks:
+            parser.Parse(chunk, False)
+        parser.Parse(b"", True)
+    except (_XmlSniffDone, expat.ExpatError):
+        pass
 
-    # xml fleur
-    if header.startswith(b"<?xml"):
-        try:
-            tree = ET.parse(filepath)
-            root = tree.getroot()
-
-            # FLEUR XML tags
-            if root.tag in ["fleurOutput", "fleurInput"]:
-                return "fleur", "FLEUR XML file"
-            elif root.find(".//iteration") is not None:
-                return "fleur", "FLEUR out.xml"
-        except:
-            pass
-        return "xml", "Generic XML"
+    # FLEUR XML tags
+    if found.get("root") in FLEUR_XML_ROOTS:
+        return "fleur", "FLEUR XML file"
+    elif found.get("iteration"):
+        return "fleur", "FLEUR out.xml"
+    return "xml", "Generic XML"
 
-    # txt files
+
+def _iter_chunks(f, chunk_size: int = XML_CHUNK_SIZE):
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def _detect_from_text(header: bytes) -> tuple[str, str]:
+    """Define the DFT code from the signatures found in a text header."""
     try:
         text = header.decode("utf-8", errors="ignore")
 
-        # FLEUR signatures
-        fleur_sigs = [
-            "This output is generated by fleur",
-            "This is FLEUR version",
-            "fleur 37",
-            "fleur 36",
-            "fleur 35",
-            "FERHIS Fermi-Energy",
-            "FERHIS: Fermi-Energy",
-            "total energy=",
-            "l-like charge",
-            "density convergence",
-            "subroutine atom2",
-            "atom2 entered",
-        ]
-
-        # CRYSTAL signatures
-        crystal_sigs = [
-            "CRYSTAL17",
-            "CRYSTAL14",
-            "CRYSTAL23",
-            "EEEE    CCCC  RRRR",
-            "UNIVERSITY OF TORINO",
-            "TOTAL ENERGY(DFT)",
-            "SCF ENDED",
-            "DIRECT LATTICE VECTORS",
-            "PRIMITIVE CELL",
-            "SHRINK FACTORS",
-        ]
-
         # count matches
-        fleur_score = sum(1 for sig in fleur_sigs if sig in text)
-        crystal_score = sum(1 for sig in crystal_sigs if sig in text)
+        fleur_score = sum(1 for sig in FLEUR_SIGNATURES if sig in text)
+        crystal_score = sum(1 for sig in CRYSTAL_SIGNATURES if sig in text)
 
         if fleur_score > 0 and fleur_score >= crystal_score:
             return "fleur", f"FLEUR (matches: {fleur_score})"
@@ -79,6 +105,48 @@ def detect_calculation_code(filepath: Union[str, Path]) -> tuple[str, str]:
     return "unknown", "Unknown code"
 
 
+def detect_calculation_code(filepath: Union[str, Path]) -> tuple[str, str]:
+    """
+    Define the DFT code used for the calculation based on file content.
+    """
+    filepath = Path(filepath)
+
+    try:
+        with open(filepath, "rb") as f:
+            header = f.read(HEADER_SIZE)
+            # xml fleur
+            if header.startswith(b"<?xml"):
+                f.seek(0)
+                return _sniff_xml(_iter_chunks(f))
+    except Exception as e:
+        return "unknown", f"Error: {e}"
+
+    # txt files
+    return _detect_from_text(header)
+
+
+def sniff_calculation_code(
+    filepath: Union[str, Path], max_bytes: int = HEADER_SIZE
+) -> tuple[str, str, int]:
+    """
+    Define the DFT code from the first max_bytes of a file only.
+    Unlike detect_calculation_code, XML files are never parsed as a whole.
+    Returns code, reason and the number of bytes read.
+    """
+    try:
+        with open(filepath, "rb") as f:
+            header = f.read(max_bytes)
+    except Exception as e:
+        return "unknown", f"Error: {e}", 0
+
+    if header.startswith(b"<?xml"):
+        code, reason = _sniff_xml([header])
+        return code, reason, len(header)
+
+    code, reason = _detect_from_text(header)
+    return code, reason, len(header)
+
+
 if __name__ == "__main__":
     # path = Path("/root/projects/ab_initio_calculations/fleur_input_copy_2/sym.xml")
     # path = Path("/root/projects/ab_initio_calculations/output_crystal/20250628_115541_8/fort.34")
@@ -0,0 +1,267 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+
+
+DEFAULT_CACHE_PATH = Path("~/.cache/dft_organizer/parse_cache.sqlite").expanduser()
+DEFAULT_MAX_BYTES = 512 * 1024**2
+HASH_CHUNK_SIZE = 1024**2
+# remembered file digests; the oldest tenth is dropped beyond this
+MAX_DIGESTS = 100_000
+# files modified this recently may change again within the same mtime
+# tick, so their digests are not remembered
+RACY_SECONDS = 2
+
+
+def file_digest(path: Union[str, Path]) -> str:
+    """Fast content hash of a file (BLAKE2b, 128 bit)"""
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(HASH_CHUNK_SIZE)
+            if not chunk:
+                break
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class ParseCache:
+    """
+    On-disk cache of parser results keyed by the content hash of the output
+    file, the files the parser also reads and the parser version.
+    The SQLite file is bounded by max_bytes, least recently used entries
+    are evicted first. Content digests are remembered by path, size, mtime
+    and inode, so a file is only hashed again once it changed.
+    Safe to share between worker processes.
+    """
+
+    def __init__(self, path: Path = DEFAULT_CACHE_PATH, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_conn"] = None
+        return state
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, timeout=60)
+            with self._conn:
+                self._conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS entries (
+                        key TEXT PRIMARY KEY,
+                        value TEXT NOT NULL,
+                        size INTEGER NOT NULL,
+                        accessed REAL NOT NULL
+                    )
+                    """
+                )
+                self._conn.execute(
+                    "CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)"
+                )
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+                )
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO meta (name, value) VALUES ('total_size', 0)"
+                )
+                self._conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS digests (
+                        path TEXT PRIMARY KEY,
+                        size INTEGER NOT NULL,
+                        mtime_ns INTEGER NOT NULL,
+                        ino INTEGER NOT NULL,
+                        digest TEXT NOT NULL
+                    )
+                    """
+                )
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO meta (name, value) VALUES ('digest_count', 0)"
+                )
+        return self._conn
+
+    @contextmanager
+    def _write(self):
+        """
+        Transaction that takes the write lock up front, so reads inside it
+        see no concurrent changes from other workers until commit
+        """
+        conn = self.conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+
+    def digest(self, path: Path) -> Optional[str]:
+        """
+        Content digest of a file, None if it does not exist; hashed only
+        when its size, mtime or inode differ from the remembered ones
+        """
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        path = str(Path(path).resolve())
+        stat = (st.st_size, st.st_mtime_ns, st.st_ino)
+        row = self.conn.execute(
+            "SELECT size, mtime_ns, ino, digest FROM digests WHERE path = ?", (path,)
+        ).fetchone()
+        if row is not None and tuple(row[:3]) == stat:
+            return row[3]
+
+        digest = file_digest(path)
+        if (
+            st.st_mtime_ns > time.time_ns() - RACY_SECONDS * 10**9
+            or os.stat(path).st_mtime_ns != st.st_mtime_ns
+        ):
+            return digest
+        with self._write() as conn:
+            known = conn.execute("SELECT 1 FROM digests WHERE path = ?", (path,)).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO digests (path, size, mtime_ns, ino, digest) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (path, *stat, digest),
+            )
+            if known is None:
+                conn.execute("UPDATE meta SET value = value + 1 WHERE name = 'digest_count'")
+                self._prune_digests(conn)
+        return digest
+
+    def _prune_digests(self, conn: sqlite3.Connection) -> None:
+        """Drop the least recently hashed tenth of the digests beyond MAX_DIGESTS"""
+        count = conn.execute("SELECT value FROM meta WHERE name = 'digest_count'").fetchone()[0]
+        if count <= MAX_DIGESTS:
+            return
+        # INSERT OR REPLACE gives a new rowid, so low rowids were hashed longest ago
+        dropped = conn.execute(
+            "DELETE FROM digests WHERE rowid IN "
+            "(SELECT rowid FROM digests ORDER BY rowid LIMIT ?)",
+            (count - int(0.9 * MAX_DIGESTS),),
+        ).rowcount
+        conn.execute("UPDATE meta SET value = value - ? WHERE name = 'digest_count'", (dropped,))
+
+    def make_key(
+        self, path: Path, parser_name: str, version: str, related_files: tuple = ()
+    ) -> str:
+        path = Path(path)
+        output_digest = self.digest(path)
+        if output_digest is None:
+            raise FileNotFoundError(path)
+        parts = [parser_name, version, output_digest]
+        for name in related_files:
+            parts.append(f"{name}={self.digest(path.parent / name) or '-'}")
+        return hashlib.blake2b("|".join(parts).encode(), digest_size=16).hexdigest()
+
+    def get(self, key: str) -> Optional[dict[str, Any]]:
+        row = self.conn.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        with self.conn:
+            self.conn.execute(
+                "UPDATE entries SET accessed = ? WHERE key = ?", (time.time(), key)
+            )
+        return json.loads(row[0])
+
+    def put(self, key: str, value: dict[str, Any]) -> None:
+        data = json.dumps(value)
+        size = len(data)
+        with self._write() as conn:
+            old = conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, accessed) VALUES (?, ?, ?, ?)",
+                (key, data, size, time.time()),
+            )
+            conn.execute(
+                "UPDATE meta SET value = value + ? WHERE name = 'total_size'",
+                (size - (old[0] if old else 0),),
+            )
+        self.evict()
+
+    def total_size(self) -> int:
+        return self.conn.execute("SELECT value FROM meta WHERE name = 'total_size'").fetchone()[0]
+
+    def evict(self) -> int:
+        """
+        Drop least recently used entries once the cache exceeds max_bytes,
+        down to 90% of it so that eviction does not run on every put.
+        Selection and deletion run in one write transaction, so concurrent
+        workers neither evict the same entries twice nor lose size updates.
+        """
+        if self.total_size() <= self.max_bytes:
+            return 0
+
+        with self._write() as conn:
+            # another worker may have evicted before the lock was taken
+            total = self.total_size()
+            excess = total - int(0.9 * self.max_bytes)
+            victims = []
+            freed = 0
+            if total > self.max_bytes:
+                cursor = conn.execute("SELECT key, size FROM entries ORDER BY accessed")
+                for key, size in cursor:
+                    if freed >= excess:
+                        break
+                    victims.append((key,))
+                    freed += size
+                cursor.close()
+            conn.executemany("DELETE FROM entries WHERE key = ?", victims)
+            conn.execute("UPDATE meta SET value = value - ? WHERE name = 'total_size'", (freed,))
+        return len(victims)
+
+    def parse(
+        self,
+        parser: Callable[[Path], dict],
+        path: Path,
+        version: str,
+        related_files: tuple = (),
+    ) -> dict[str, Any]:
+        """Return the cached result of parser(path), parsing on a miss"""
+        try:
+            parser_name = f"{parser.__module__}.{parser.__qualname__}"
+            key = self.make_key(path, parser_name, version, related_files)
+        except OSError:
+            return parser(path)
+
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+
+        result = parser(path)
+        self.put(key, result)
+        return result
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+def cached_parse(
+    cache: Optional[ParseCache],
+    parser: Callable[[Path], dict],
+    path: Path,
+    version: str,
+    related_files: tuple = (),
+) -> dict[str, Any]:
+    """Call parser(path) through the cache if one is given"""
+    if cache is None:
+        return parser(path)
+    return cache.parse(parser, Path(path), version, related_files)
@@ -0,0 +1,50 @@
+import re
+from pathlib import Path
+from typing import Optional, Union
+
+from dft_organizer.mmap_scan import mapped_file
+
+
+TAIL_CHUNK_SIZE = 64 * 1024
+
+
+def search_tail(
+    path: Union[str, Path],
+    patterns: dict[str, re.Pattern],
+    chunk_size: int = TAIL_CHUNK_SIZE,
+    max_bytes: Optional[int] = None,
+) -> dict[str, Optional[tuple]]:
+    """
+    Find the last match of every bytes pattern, searching from the end.
+    The window searched back from EOF doubles from chunk_size until all
+    patterns matched or the whole file (or max_bytes) was covered, so
+    quantities printed at the end of a run are found after touching a few
+    pages of the mapped file, whatever its size.
+    Returns the groups of the last match per pattern, None if not found.
+    Patterns must match within a line; the window starts at a line break.
+    """
+    found: dict[str, Optional[tuple]] = {name: None for name in patterns}
+
+    with mapped_file(path) as buf:
+        size = len(buf)
+        limit = size if max_bytes is None else min(size, max_bytes)
+        window = chunk_size
+
+        while True:
+            start = max(size - window, size - limit)
+            if start > 0:
+                # skip the partial first line
+                start = buf.find(b"\n", start) + 1 or size
+
+            for name, pattern in patterns.items():
+                if found[name] is not None:
+                    continue
+                match = None
+                for match in pattern.finditer(buf, start):
+                    pass
+                if match is not None:
+                    found[name] = match.groups()
+
+            if all(m is not None for m in found.values()) or size - window <= size - limit:
+                return found
+            window *= 2
@@ -1,8 +1,21 @@
+from pathlib import Path
+from typing import Optional
+
 import polars as pl
 
 from dft_organizer.crystal_parser import parse_crystal_output
+from dft_organizer.crystal_parser.summary import (
+    parse_crystal_output_fast,
+    PARSER_VERSION as CRYSTAL_PARSER_VERSION,
+    RELATED_FILES as CRYSTAL_RELATED_FILES,
+)
 from dft_organizer.fleur_parser import parse_fleur_output
-from dft_organizer.fmt import detect_calculation_code
+from dft_organizer.fleur_parser.summary import (
+    PARSER_VERSION as FLEUR_PARSER_VERSION,
+    RELATED_FILES as FLEUR_RELATED_FILES,
+)
+from dft_organizer.fmt import detect_calculation_code, sniff_calculation_code
+from dft_organizer.parse_cache import ParseCache, cached_parse
 
 
 def get_table_string(res: dict) -> str:
@@ -55,11 +68,57 @@ def detect_engine(filenames: list, current_dir) -> dict:
         return "unknown"
 
 
-def create_summary_table(path_dict: dict) -> pl.DataFrame:
+def detect_engine_by_filenames(filenames: list, current_dir) -> tuple[str, int]:
+    """
+    Detect DFT engine from file names, reading the header of at most one file:
+    CRYSTAL needs OUTPUT confirmed by its header, FLEUR needs out, or out.xml
+    next to inp.xml/fleur.error or confirmed by its header.
+    Returns the engine and the number of bytes read.
+    """
+    names = set(filenames)
+    bytes_read = 0
+
+    if "OUTPUT" in names:
+        code, _, bytes_read = sniff_calculation_code(current_dir / "OUTPUT")
+        if code == "crystal":
+            return "crystal", bytes_read
+
+    if "out" in names:
+        return "fleur", bytes_read
+    if "out.xml" in names:
+        if "inp.xml" in names or "fleur.error" in names:
+            return "fleur", bytes_read
+        if "OUTPUT" not in names:
+            code, _, bytes_read = sniff_calculation_code(current_dir / "out.xml")
+            if code == "fleur":
+                return "fleur", bytes_read
+
+    return "unknown", bytes_read
+
+
+def parse_crystal_output_cached(
+    path: Path, cache: Optional[ParseCache] = None, fast: bool = False
+) -> dict:
+    """parse_crystal_output (or its fast path) through the parse cache, if one is given"""
+    parser = parse_crystal_output_fast if fast else parse_crystal_output
+    return cached_parse(
+        cache, parser, Path(path), CRYSTAL_PARSER_VERSION, CRYSTAL_RELATED_FILES
+    )
+
+
+def parse_fleur_output_cached(path: Path, cache: Optional[ParseCache] = None) -> dict:
+    """parse_fleur_output through the parse cache, if one is given"""
+    return cached_parse(
+        cache, parse_fleur_output, Path(path), FLEUR_PARSER_VERSION, FLEUR_RELATED_FILES
+    )
+
+
+def create_summary_table(path_dict: dict, cache: Optional[ParseCache] = None) -> pl.DataFrame:
     """Create summary table comparing CRYSTAL and FLEUR results
 
     Args:
         path_dict (dict): {'H': {'crystal': 'path/to/OUTPUT', 'fleur': 'path/to/out'}, ...}
+        cache (ParseCache): optional cache of parser results
     Returns:
         pl.DataFrame: Summary of CPU time and bandgap from both codes.
     """
@@ -71,7 +130,7 @@ def create_summary_table(path_dict: dict) -> pl.DataFrame:
         fleur_file = paths.get("fleur")
 
         if crystal_file:
-            crystal_res = parse_crystal_output(crystal_file)
+            crystal_res = parse_crystal_output_cached(crystal_file, cache)
             row_data.update(
                 {
                     "CRYSTAL_Time": crystal_res.get("cpu_time", "N/A"),
@@ -82,7 +141,7 @@ def create_summary_table(path_dict: dict) -> pl.DataFrame:
             row_data.update({"CRYSTAL_Time": "N/A", "CRYSTAL_Bandgap": "N/A"})
 
         if fleur_file:
-            fleur_res = parse_fleur_output(fleur_file)
+            fleur_res = parse_fleur_output_cached(fleur_file, cache)
             row_data.update(
                 {
                     "FLEUR_Time": fleur_res.get("cpu_time", "N/A"),
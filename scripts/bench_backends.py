@@ -0,0 +1,102 @@
+"""
+Benchmark the archive backends (7-Zip executable and py7zr) on a
+calculation tree: compression and extraction time per profile, and
+whether every backend unpacks the archives of every other backend to
+the original files. With --file-policy the archives hold several 7z
+folders (full, light and stored files), written by appending.
+"""
+import argparse
+import filecmp
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from dft_organizer.core.file_policy import FILE_POLICIES
+from dft_organizer.core.sevenzip import (
+    COMPRESSION_PROFILES,
+    find_7z,
+    get_backend,
+    write_archive,
+)
+
+
+def same_tree(left: Path, right: Path) -> bool:
+    comparison = filecmp.dircmp(left, right)
+    if comparison.left_only or comparison.right_only or comparison.funny_files:
+        return False
+    _, mismatch, errors = filecmp.cmpfiles(left, right, comparison.common_files, shallow=False)
+    if mismatch or errors:
+        return False
+    return all(same_tree(left / name, right / name) for name in comparison.common_dirs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("path", type=Path, help="Calculation directory tree")
+    parser.add_argument(
+        "--profile",
+        action="append",
+        choices=list(COMPRESSION_PROFILES),
+        help="Profiles to run, repeatable (default: max and fast)",
+    )
+    parser.add_argument(
+        "--file-policy",
+        choices=list(FILE_POLICIES),
+        help="Write the archives with this per-file policy",
+    )
+    args = parser.parse_args()
+
+    backends = ["py7zr"]
+    if find_7z():
+        backends.append("7z")
+    else:
+        print("No 7-Zip executable on PATH, benchmarking py7zr only")
+
+    source_dir = args.path.resolve()
+    for profile in args.profile or ("max", "fast"):
+        print(f"{profile}:")
+        with tempfile.TemporaryDirectory() as work_dir:
+            work_dir = Path(work_dir)
+            archives = {}
+            for name in backends:
+                if not get_backend(name).supports(profile):
+                    print(f"  {name:<6} cannot write {profile}")
+                    continue
+                archive_path = work_dir / f"{name}.7z"
+                start = time.perf_counter()
+                input_bytes = write_archive(
+                    source_dir,
+                    archive_path,
+                    profile=profile,
+                    file_policy=FILE_POLICIES.get(args.file_policy),
+                    backend=name,
+                )
+                elapsed = time.perf_counter() - start
+                output_bytes = archive_path.stat().st_size
+                archives[name] = archive_path
+                print(
+                    f"  {name:<6} compress {elapsed:8.2f} s  {input_bytes / 1024**2 / elapsed:8.1f} MB/s  "
+                    f"ratio {input_bytes / max(output_bytes, 1):6.2f}"
+                )
+
+            for written_by, archive_path in archives.items():
+                for name in backends:
+                    target_dir = work_dir / f"{written_by}_by_{name}"
+                    start = time.perf_counter()
+                    try:
+                        get_backend(name).extract(archive_path, target_dir)
+                    except Exception as e:
+                        print(f"  {name:<6} extract {written_by} archive failed: {e}")
+                        continue
+                    elapsed = time.perf_counter() - start
+                    ok = same_tree(source_dir, target_dir / source_dir.name)
+                    print(
+                        f"  {name:<6} extract  {elapsed:8.2f} s  ({written_by} archive, "
+                        f"{'identical' if ok else 'DIFFERENT'} files)"
+                    )
+                    shutil.rmtree(target_dir)
+
+
+if __name__ == "__main__":
+    main()
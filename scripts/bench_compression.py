@@ -0,0 +1,71 @@
+"""
+Benchmark the dft-pack compression profiles on a calculation tree:
+archive time, throughput (MB/s of input) and compression ratio,
+optionally also with a per-file compression policy.
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from dft_organizer.core.file_policy import FILE_POLICIES
+from dft_organizer.core.sevenzip import COMPRESSION_PROFILES, write_archive
+
+
+def measure(
+    source_dir: Path, profile: str, work_dir: Path, file_policy=None
+) -> tuple[float, int, int]:
+    archive_path = work_dir / f"{source_dir.name}.{profile}.7z"
+    start = time.perf_counter()
+    input_bytes = write_archive(
+        source_dir, archive_path, profile=profile, file_policy=file_policy
+    )
+    elapsed = time.perf_counter() - start
+    output_bytes = archive_path.stat().st_size
+    archive_path.unlink()
+    return elapsed, input_bytes, output_bytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("path", type=Path, help="Calculation directory tree")
+    parser.add_argument(
+        "--profile",
+        action="append",
+        choices=list(COMPRESSION_PROFILES),
+        help="Profiles to run, repeatable (default: all)",
+    )
+    parser.add_argument(
+        "--file-policy",
+        choices=list(FILE_POLICIES),
+        help="Also run every profile with this per-file policy",
+    )
+    args = parser.parse_args()
+
+    runs = [(profile, None) for profile in args.profile or COMPRESSION_PROFILES]
+    if args.file_policy:
+        runs = [
+            run
+            for profile, _ in runs
+            for run in ((profile, None), (profile, args.file_policy))
+        ]
+
+    source_dir = args.path.resolve()
+    with tempfile.TemporaryDirectory() as work_dir:
+        for profile, policy in runs:
+            label = f"{profile}+{policy}" if policy else profile
+            try:
+                elapsed, input_bytes, output_bytes = measure(
+                    source_dir, profile, Path(work_dir), FILE_POLICIES.get(policy)
+                )
+            except Exception as e:
+                print(f"{label:<14} failed: {e}")
+                continue
+            print(
+                f"{label:<14} {elapsed:8.2f} s  {input_bytes / 1024**2 / elapsed:8.1f} MB/s  "
+                f"{output_bytes / 1024**2:9.1f} MB  ratio {input_bytes / max(output_bytes, 1):6.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Benchmark CRYSTAL OUTPUT parsing: the full pycrystal CRYSTOUT versus
+the summary-only line scan (SummaryCRYSTOUT) on the given outputs.
+"""
+import argparse
+import time
+import tracemalloc
+from pathlib import Path
+
+from pycrystal import CRYSTOUT
+
+from dft_organizer.crystal_parser.fast_output import SummaryCRYSTOUT
+
+
+def measure(cls, path: Path, repeat: int) -> tuple[float, float]:
+    """Mean time over repeat runs, peak memory from a separate traced run"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        cls(str(path))
+    elapsed = (time.perf_counter() - start) / repeat
+
+    tracemalloc.start()
+    try:
+        cls(str(path))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return elapsed, peak / 1024**2
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("paths", nargs="+", type=Path, help="CRYSTAL OUTPUT files")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    totals = {"CRYSTOUT": 0.0, "summary": 0.0}
+    for path in args.paths:
+        size_mb = path.stat().st_size / 1024**2
+        print(f"{path}: {size_mb:.1f} MB")
+        for label, cls in (("CRYSTOUT", CRYSTOUT), ("summary", SummaryCRYSTOUT)):
+            try:
+                elapsed, peak = measure(cls, path, args.repeat)
+            except Exception as e:
+                print(f"  {label:<10} failed: {e}")
+                continue
+            totals[label] += elapsed
+            print(f"  {label:<10} {elapsed:8.3f} s  peak {peak:8.2f} MB")
+
+    if totals["summary"]:
+        print(f"\nTotal: CRYSTOUT {totals['CRYSTOUT']:.3f} s, summary {totals['summary']:.3f} s, "
+              f"speed-up {totals['CRYSTOUT'] / totals['summary']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
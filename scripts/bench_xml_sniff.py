@@ -0,0 +1,87 @@
+"""
+Benchmark FLEUR XML detection: full ET.parse (old path) versus
+the streaming sniffer of detect_calculation_code on a synthetic out.xml.
+"""
+import argparse
+import tempfile
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+from dft_organizer.fmt import detect_calculation_code
+
+
+ITERATION = """    <iteration numberForCurrentRun="{n}" overallNumber="{n}">
+      <energyParameters units="Htr">
+        <atomicEnergyParameters atomType="1" spin="1" branch="4s" type="s" value="0.1234567890"/>
+      </energyParameters>
+      <eigenvalues>
+        <eigenvaluesAt spin="1" ikpt="1" k_x="0.0" k_y="0.0" k_z="0.0">
+{eigenvalues}
+        </eigenvaluesAt>
+      </eigenvalues>
+      <totalEnergy value="-3600.1234567890" units="Htr"/>
+      <densityConvergence units="me/bohr^3">
+        <chargeDensity spin="1" distance="{distance}"/>
+      </densityConvergence>
+    </iteration>
+"""
+
+
+def write_synthetic_outxml(path: Path, iterations: int, root: str) -> None:
+    eigenvalues = "\n".join(
+        "                 " + " ".join(f"{-0.5 + 0.001 * i:.10f}" for i in range(8))
+        for _ in range(40)
+    )
+    with open(path, "w") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8" standalone="no"?>\n')
+        f.write(f'<{root} fleurOutputVersion="0.34">\n  <scfLoop>\n')
+        for n in range(1, iterations + 1):
+            f.write(ITERATION.format(n=n, eigenvalues=eigenvalues, distance=1.0 / n))
+        f.write(f"  </scfLoop>\n</{root}>\n")
+
+
+def detect_full_parse(filepath: Path) -> tuple[str, str]:
+    """Old detection path: build the whole tree to label the file"""
+    try:
+        root = ET.parse(filepath).getroot()
+        if root.tag in ["fleurOutput", "fleurInput"]:
+            return "fleur", "FLEUR XML file"
+        elif root.find(".//iteration") is not None:
+            return "fleur", "FLEUR out.xml"
+    except Exception:
+        pass
+    return "xml", "Generic XML"
+
+
+def measure(func, path: Path) -> tuple[tuple[str, str], float, float]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(path)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / 1024**2
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # fleurOutput root stops at once, a generic root has to reach the first <iteration>
+        for root in ("fleurOutput", "calculation"):
+            path = Path(tmp) / f"{root}.xml"
+            write_synthetic_outxml(path, args.iterations, root)
+            size_mb = path.stat().st_size / 1024**2
+            print(f"{root}: {size_mb:.1f} MB, {args.iterations} iterations")
+
+            for label, func in (("ET.parse", detect_full_parse), ("streaming", detect_calculation_code)):
+                result, elapsed, peak = measure(func, path)
+                print(f"  {label:<10} {elapsed:8.3f} s  peak {peak:8.2f} MB  -> {result}")
+
+
+if __name__ == "__main__":
+    main()
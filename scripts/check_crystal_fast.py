@@ -0,0 +1,75 @@
+"""
+Equivalence check of the summary-only CRYSTAL fast path against the full
+pycrystal parser: both parse every OUTPUT (or *.out) file under the given
+paths and all summary fields are compared. Exits with 1 on any mismatch.
+"""
+import argparse
+import math
+import sys
+from pathlib import Path
+
+from dft_organizer.crystal_parser.fast_output import SummaryCRYSTOUT
+from dft_organizer.crystal_parser.summary import parse_crystal_output
+
+
+def find_outputs(paths: list[Path]) -> list[Path]:
+    outputs = []
+    for path in paths:
+        if path.is_file():
+            outputs.append(path)
+            continue
+        outputs.extend(sorted(p for p in path.rglob("*") if p.name == "OUTPUT" or p.suffix == ".out"))
+    return outputs
+
+
+def same(a, b) -> bool:
+    if isinstance(a, float) and isinstance(b, float):
+        return a == b or (math.isnan(a) and math.isnan(b))
+    if isinstance(a, (list, tuple)) and isinstance(b, (list, tuple)):
+        return len(a) == len(b) and all(same(x, y) for x, y in zip(a, b))
+    return a == b
+
+
+def parse_or_error(path: Path, fast: bool) -> dict:
+    try:
+        return parse_crystal_output(path, fast=fast)
+    except Exception as e:
+        return {"exception": type(e).__name__}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("paths", nargs="+", type=Path, help="OUTPUT files or directories")
+    args = parser.parse_args()
+
+    outputs = find_outputs(args.paths)
+    mismatches = fallbacks = 0
+
+    for path in outputs:
+        try:
+            SummaryCRYSTOUT(str(path))
+        except Exception as e:
+            fallbacks += 1
+            print(f"fallback  {path}: {e}")
+
+        full = parse_or_error(path, fast=False)
+        fast = parse_or_error(path, fast=True)
+        diff = [
+            key
+            for key in sorted(set(full) | set(fast))
+            if not same(full.get(key), fast.get(key))
+        ]
+        if diff:
+            mismatches += 1
+            print(f"MISMATCH  {path}")
+            for key in diff:
+                print(f"  {key}: full={full.get(key)!r} fast={fast.get(key)!r}")
+        else:
+            print(f"ok        {path}")
+
+    print(f"\n{len(outputs)} outputs, {mismatches} mismatches, {fallbacks} fell back to CRYSTOUT")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Check of the UUID lookups on a temporary AiiDA-style tree with dashed
+shard directories (root/xx/yy/rest-with-dashes): dashed, plain and
+uppercase UUIDs must resolve through the sharded path, the UUID index
+and the fallback walk, and deeper directories must not replace the
+indexed shard directory. Exits with 1 on any failure.
+"""
+import sys
+import tempfile
+from pathlib import Path
+
+from dft_organizer.core.reporting import _index_uuid_tree, find_calculation_by_uuid
+from dft_organizer.core.uuid_index import UuidIndex
+
+
+DASHED = "0a2fa4e3-fb3e-4c1e-9a57-3b0d1c2e4f60"
+# written in uppercase, so only the walk finds it
+UPPER = "5D7E9B21-0C4A-4F3B-8E6D-A1B2C3D4E5F6"
+
+
+def main():
+    failures = []
+
+    def check(name: str, found, expected: Path):
+        if found != expected:
+            failures.append(f"{name}: {found} != {expected}")
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        root_path = Path(work_dir).resolve() / "repository"
+        calc_dir = root_path / DASHED[:2] / DASHED[2:4] / DASHED[4:]
+        (calc_dir / "out" / "deeper").mkdir(parents=True)
+        upper_dir = root_path / UPPER[:2] / UPPER[2:4] / UPPER[4:]
+        upper_dir.mkdir(parents=True)
+        index_path = Path(work_dir) / "index.sqlite"
+
+        with UuidIndex(root_path, index_path) as uuid_index:
+            for uuid in (DASHED, DASHED.replace("-", ""), DASHED.upper()):
+                check(f"path {uuid}", find_calculation_by_uuid(root_path, uuid, uuid_index), calc_dir)
+
+            # the walk keys the dashed directory name, lookups strip the dashes
+            check("walk", find_calculation_by_uuid(root_path, UPPER.lower(), uuid_index), upper_dir)
+            check("index", uuid_index.lookup(UPPER.replace("-", "")), upper_dir)
+
+            # deeper directories share the UUID but must not win
+            uuid_index.add(DASHED, calc_dir)
+            _index_uuid_tree(root_path, uuid_index)
+            check("depth", uuid_index.lookup(DASHED.replace("-", "")), calc_dir)
+
+    for failure in failures:
+        print(failure)
+    print(f"{len(failures)} failures")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()